@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+import threading
+import traceback
+from typing import Any, Dict, Hashable, Optional, Tuple, TYPE_CHECKING
+
+import save_codecs
+import save_format
+
+if TYPE_CHECKING:
+    from engine import Engine
+
+# what save_format.snapshot_sections took, None for the sections skipped
+Snapshot = Dict[str, Any]
+
+
+class Autosaver:
+    """
+    saves the game every few turns and whenever the player reaches a new floor,
+    without holding the game up for it
+    the main thread only takes a snapshot, copies of the state each save section is made of,
+    a worker thread encodes and compresses them with the engine's save_codec and replaces
+    the save file
+    sections that are the same as in the last save arent compressed again, and
+    the ones whose key in save_format.section_keys didnt change arent even snapshotted
+    """
+
+    def __init__(self, filename: str, every: int = 50):
+        self.filename = filename
+        self.every = every
+        self.turns = 0  # since the last save
+        self.floor: Optional[int] = None
+        # section keys at the last snapshot, main thread only
+        self.keys: Dict[str, Hashable] = {}
+        # set by a write that failed, under the condition, so the next
+        # snapshot forgets the keys and takes every section again
+        self.failed = False
+        # each section as last saved, raw with its codec preset and compressed,
+        # owned by whoever is writing
+        self.raw: Dict[str, Tuple[bytes, str]] = {}
+        self.stored: Dict[str, save_format.Stored] = {}
+        self.condition = threading.Condition()
+        self.pending: Optional[Snapshot] = None
+        # of the pending snapshot
+        self.preset = save_codecs.DEFAULT
+        self.summary: Optional[save_format.Summary] = None
+        self.busy = False
+        self.closed = False
+        self.worker: Optional[threading.Thread] = None
+        self.saves = 0
+        self.sections_reused = 0
+
+    def turn_finished(self, engine: Engine) -> None:
+        """called after every player turn, saves if it is time to"""
+        self.turns += 1
+        floor = engine.game_world.current_floor
+        if (self.turns >= self.every or floor != self.floor) and engine.player.is_alive:
+            self.save(engine)
+
+    def snapshot(self, engine: Engine) -> Snapshot:
+        with self.condition:
+            if self.failed:
+                self.keys = {}
+                self.failed = False
+        keys = save_format.section_keys(engine)
+        unchanged = [name for name, key in keys.items() if self.keys.get(name) == key]
+        self.keys = keys
+        self.turns = 0
+        self.floor = engine.game_world.current_floor
+        return save_format.snapshot_sections(engine, skip=unchanged)
+
+    def save(self, engine: Engine) -> None:
+        """snapshot now and leave the rest to the worker thread"""
+        if self.closed:
+            return
+        snapshot = self.snapshot(engine)
+        with self.condition:
+            self._merge_pending(snapshot)
+            self.pending, self.preset = snapshot, engine.save_codec
+            self.summary = save_format.Summary.of(engine)
+            self.condition.notify_all()
+        if self.worker is None:
+            self.worker = threading.Thread(target=self._run, daemon=True)
+            self.worker.start()
+
+    def save_now(self, engine: Engine, filename: str) -> None:
+        """save and wait for it, on quitting. reuses what the worker compressed before"""
+        with self.condition:
+            while self.busy:
+                self.condition.wait()
+            snapshot = self.snapshot(engine)
+            self._merge_pending(snapshot)
+            self.pending = None
+            self.busy = True
+        try:
+            # unlike autosaves, errors reach the caller, the game is quitting
+            self._write(snapshot, save_format.Summary.of(engine), filename, engine.save_codec)
+        finally:
+            with self.condition:
+                self.busy = False
+                self.condition.notify_all()
+
+    def wait(self) -> None:
+        """until the worker has written everything it was given"""
+        with self.condition:
+            while self.pending is not None or self.busy:
+                self.condition.wait()
+
+    def close(self) -> None:
+        """drop any save not started yet and wait for the one in progress"""
+        with self.condition:
+            self.closed = True
+            self.pending = None
+            self.condition.notify_all()
+        if self.worker is not None:
+            self.worker.join()
+
+    def _merge_pending(self, snapshot: Snapshot) -> None:
+        """
+        a snapshot the worker hasnt got to is replaced by the newer one,
+        which may have skipped sections because they were in the older one
+        """
+        if self.pending is not None:
+            for name, state in self.pending.items():
+                if snapshot.get(name) is None:
+                    snapshot[name] = state
+
+    def _run(self) -> None:
+        while True:
+            with self.condition:
+                while self.pending is None and not self.closed:
+                    self.condition.wait()
+                if self.pending is None:
+                    return
+                snapshot, summary, preset = self.pending, self.summary, self.preset
+                self.pending = None
+                self.busy = True
+            try:
+                self._write(snapshot, summary, self.filename, preset)
+            except Exception:
+                # the game goes on, the next autosave tries again
+                traceback.print_exc()
+            finally:
+                with self.condition:
+                    self.busy = False
+                    self.condition.notify_all()
+
+    def _write(
+            self, snapshot: Snapshot, summary: save_format.Summary, filename: str, preset: str
+    ) -> None:
+        try:
+            for name, state in snapshot.items():
+                if state is None:
+                    raw = self.raw[name][0]  # its key says it is as last saved
+                else:
+                    raw = save_format.encode_section(name, state)
+                if (raw, preset) == self.raw.get(name):
+                    self.sections_reused += 1
+                    continue
+                self.stored[name] = save_format.compress(name, raw, preset)
+                self.raw[name] = raw, preset
+            save_format.write_atomic(
+                filename,
+                save_format.pack({name: self.stored[name] for name in snapshot}, summary),
+            )
+            self.saves += 1
+        except BaseException:
+            # what this save left out as unchanged may not be in raw, and what raw holds may
+            # be older than the keys say, forget both. a snapshot already waiting that
+            # relied on them fails on the missing raw instead of saving stale sections
+            self.raw, self.stored = {}, {}
+            with self.condition:
+                self.failed = True
+            raise
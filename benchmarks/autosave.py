@@ -0,0 +1,50 @@
+"""
+how long saving holds up the main thread: a full synchronous save against an
+autosave, which only snapshots the sections that changed and leaves the rest to
+its worker thread, on the long game from benchmarks.save_load
+"""
+from __future__ import annotations
+
+import os
+import tempfile
+import time
+
+from benchmarks.common import timeit
+from benchmarks.save_load import long_game
+import actions
+from autosave import Autosaver
+import input_handlers
+import save_format
+
+
+def main() -> None:
+    engine = long_game()
+    handler = input_handlers.MainEventHandler(engine)
+    with tempfile.TemporaryDirectory() as directory:
+        filename = os.path.join(directory, "savegame.sav")
+        full = timeit(lambda: save_format.save(engine, filename))
+        print(f"synchronous save   {full * 1000:7.1f} ms on the main thread")
+
+        autosaver = Autosaver(filename)
+        autosaver.save(engine)
+        autosaver.wait()  # the first one compresses everything
+        stalls, background = [], []
+        for _ in range(20):
+            handler.handle_action(actions.WaitAction(engine.player))
+            start = time.perf_counter()
+            autosaver.save(engine)
+            stalls.append(time.perf_counter() - start)
+            autosaver.wait()
+            background.append(time.perf_counter() - start)
+        autosaver.close()
+        stalls.sort()
+        background.sort()
+        print(
+            f"autosave snapshot  {stalls[len(stalls) // 2] * 1000:7.1f} ms on the main thread, "
+            f"{background[len(background) // 2] * 1000:.1f} ms until written (medians)"
+        )
+        print(f"  {autosaver.sections_reused} of {autosaver.saves * 8} sections reused")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""
+save latency, load latency and file size for each save_codecs preset,
+on a fresh floor 1 and on the long floor 10 game from benchmarks.save_load,
+then one big section compressed in one piece against in chunks on the thread pool
+"""
+from __future__ import annotations
+
+import numpy as np
+
+from benchmarks.common import new_engine, timeit
+from benchmarks.save_load import long_game
+import save_codecs
+import save_format
+
+
+def main() -> None:
+    for label, engine in (("floor 1", new_engine()), ("floor 10, 200x200", long_game())):
+        print(label)
+        for preset in save_codecs.PRESETS:
+            data = save_format.dumps(engine, preset)
+            save = timeit(lambda: save_format.dumps(engine, preset))
+            load = timeit(lambda: save_format.loads(data))
+            print(
+                f"  {preset:10} save {save * 1000:7.1f} ms  load {load * 1000:7.1f} ms  "
+                f"{len(data) / 1024:8.1f} KiB"
+            )
+
+    # a map's worth of tile ids the size of a huge floor
+    rng = np.random.default_rng(0)
+    raw = np.repeat(rng.integers(0, 3, 8 << 20, dtype=np.uint8), 2).tobytes()
+    print(f"one {len(raw) >> 20} MiB section")
+    chunk_size = save_codecs.CHUNK_SIZE
+    for preset in ("zlib", "lzma-fast"):
+        for chunked in (False, True):
+            save_codecs.CHUNK_SIZE = chunk_size if chunked else len(raw)
+            codec, payload = save_codecs.compress(raw, preset)
+            save = timeit(lambda: save_codecs.compress(raw, preset), repeat=3)
+            load = timeit(lambda: save_codecs.decompress(codec, payload), repeat=3)
+            print(
+                f"  {preset:10} {'chunked' if chunked else 'whole':8} compress {save * 1000:7.1f} ms  "
+                f"decompress {load * 1000:6.1f} ms  {len(payload) / 1024:8.1f} KiB"
+            )
+    save_codecs.CHUNK_SIZE = chunk_size
+
+
+if __name__ == "__main__":
+    main()
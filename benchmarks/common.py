@@ -0,0 +1,74 @@
+"""
+shared helpers for the headless benchmarks
+run benchmarks from the repo root, e.g. python -m benchmarks.enemy_turns
+"""
+from __future__ import annotations
+
+import random
+import time
+from typing import Callable, List
+
+import numpy as np
+
+import entity_factories
+import setup_game
+from engine import Engine
+from entity import Actor
+
+
+def new_engine(seed: int = 0) -> Engine:
+    """a fresh game on floor 1, without opening a window"""
+    random.seed(seed)
+    return setup_game.new_game()
+
+
+def big_floor(engine: Engine, width: int, height: int, max_rooms: int) -> None:
+    """replace the current floor with a bigger freshly generated one"""
+    world = engine.game_world
+    world.map_width, world.map_height, world.max_rooms = width, height, max_rooms
+    world.current_floor -= 1
+    world.generate_floor()
+    engine.update_fov()
+
+
+def descend(engine: Engine, floor: int) -> None:
+    """generate floors until the engine reaches the given floor"""
+    while engine.game_world.current_floor < floor:
+        engine.game_world.generate_floor()
+    engine.update_fov()
+
+
+def add_monsters(engine: Engine, count: int, prototype: Actor = entity_factories.orc) -> List[Actor]:
+    """spawn extra monsters on free floor tiles of the current map"""
+    game_map = engine.game_map
+    free = [
+        (x, y)
+        for x in range(game_map.width)
+        for y in range(game_map.height)
+        if game_map.walkable[x, y]
+        and not game_map.get_blocking_entity_at_location(x, y)
+    ]
+    random.shuffle(free)
+    return [prototype.spawn(game_map, x, y) for x, y in free[:count]]
+
+
+def everyone_chases(engine: Engine) -> None:
+    """
+    keep every monster on the floor awake and chasing the player, seeing the whole
+    map wakes them, and they only chase a player they see, which walls mostly prevent
+    the map stays all visible until the player moves, fov updates from where the
+    player already stood are skipped, see GameMap.update_visible
+    """
+    game_map = engine.game_map
+    game_map.visible[:] = True
+    game_map.sees_player = lambda xs, ys, radii: np.ones(len(xs), dtype=bool)
+
+
+def timeit(func: Callable[[], object], repeat: int = 5) -> float:
+    """best wall time of a few runs, in seconds"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
@@ -0,0 +1,64 @@
+"""
+time to load a save and to get to the first frame drawn after picking Continue, on floors
+of a few sizes: the old pickled Engine compressed with lzma, save_format with the default
+preset, and save_format with the "none" preset, which skips decompressing,
+and the time the main menu takes to read the save's summary
+"""
+from __future__ import annotations
+
+import lzma
+import os
+import pickle
+import tempfile
+
+from tcod.console import Console
+
+from benchmarks.common import big_floor, new_engine, timeit
+from engine import Engine
+import save_format
+
+
+def first_frame(load) -> None:
+    engine: Engine = load()
+    # the whole map is drawn, there is no camera
+    width, height = engine.game_map.width, engine.game_map.height
+    engine.render(Console(max(80, width), max(50, height), order="F"))
+
+
+def main() -> None:
+    engine = new_engine()
+    directory = tempfile.mkdtemp()
+    for width, height, rooms in ((80, 43, 30), (200, 200, 200), (1000, 1000, 3000)):
+        if (width, height) != (80, 43):
+            big_floor(engine, width, height, rooms)
+        legacy = os.path.join(directory, f"{width}.pickle")
+        with open(legacy, "wb") as f:
+            f.write(lzma.compress(pickle.dumps(engine)))
+        filename = os.path.join(directory, f"{width}.sav")
+        save_format.save(engine, filename)
+        uncompressed = os.path.join(directory, f"{width}-none.sav")
+        save_format.save(engine, uncompressed, "none")
+
+        def read_legacy() -> Engine:
+            with open(legacy, "rb") as f:
+                return save_format.loads_legacy(f.read())
+
+        summary = timeit(lambda: save_format.read_summary(filename), repeat=100)
+        print(
+            f"{width}x{height}: {os.path.getsize(filename) / 1024:.0f} KiB, "
+            f"{os.path.getsize(uncompressed) / 1024:.0f} KiB uncompressed, "
+            f"summary for the main menu {summary * 1e6:.0f} us"
+        )
+        for name, load in (
+                ("pickle+lzma", read_legacy),
+                ("zlib", lambda: save_format.load(filename)),
+                ("none", lambda: save_format.load(uncompressed)),
+        ):
+            print(
+                f"  {name:12} load {timeit(load) * 1000:7.1f} ms  "
+                f"first frame {timeit(lambda: first_frame(load)) * 1000:7.1f} ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+"""
+enemy turn cost on a large floor as the total population grows,
+with far away monsters asleep and with everyone awake
+"""
+from __future__ import annotations
+
+import time
+
+from benchmarks.common import add_monsters, big_floor, new_engine
+
+
+def turn_cost(engine, turns: int = 30) -> float:
+    """average ms per enemy turn"""
+    start = time.perf_counter()
+    for _ in range(turns):
+        engine.handle_enemy_turns()
+    return (time.perf_counter() - start) * 1000 / turns
+
+
+def main() -> None:
+    print(f"{'monsters':>8} {'awake':>6} {'all awake ms':>13} {'dormancy ms':>12}")
+    for count in (100, 500, 1000, 2000, 4000):
+        engine = new_engine()
+        big_floor(engine, 300, 300, 600)
+        add_monsters(engine, count)
+        engine.player.fighter.max_hp = engine.player.fighter.hp = 10 ** 9
+
+        dormancy = engine.game_map.dormancy
+        dormancy.activation_radius = 10 ** 6
+        everyone = turn_cost(engine)
+
+        dormancy.activation_radius = 20
+        engine.handle_enemy_turns()  # let the far away monsters fall asleep
+        sleeping = turn_cost(engine)
+        print(f"{count:>8} {len(dormancy.awake):>6} {everyone:>13.2f} {sleeping:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
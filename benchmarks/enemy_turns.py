@@ -0,0 +1,63 @@
+"""
+compare the path work of a full enemy turn:
+one path search per monster (BaseAI.get_path_to) against
+the shared player distance map on GameMap,
+then whole enemy turns with and without the batched decision pass
+"""
+from __future__ import annotations
+
+import copy
+import time
+
+from benchmarks.common import add_monsters, everyone_chases, new_engine, timeit
+
+
+def path_work() -> None:
+    print(f"{'monsters':>8} {'per-monster ms':>15} {'distance map ms':>16} {'speedup':>8}")
+    for count in (10, 25, 50, 100, 200, 400):
+        engine = new_engine()
+        monsters = add_monsters(engine, count)
+        player = engine.player
+        game_map = engine.game_map
+
+        def per_monster() -> None:
+            for monster in monsters:
+                monster.ai.get_path_to(player.x, player.y)
+
+        def distance_map() -> None:
+            game_map.invalidate_player_distance()
+            for monster in monsters:
+                game_map.path_to_player(monster.x, monster.y)
+
+        old = timeit(per_monster) * 1000
+        new = timeit(distance_map) * 1000
+        print(f"{len(monsters):>8} {old:>15.2f} {new:>16.2f} {old / new:>7.1f}x")
+
+
+def turn_throughput(turns: int = 50) -> None:
+    print(f"{'monsters':>8} {'one by one ms/turn':>19} {'batched ms/turn':>16}")
+    for count in (50, 100, 200, 400, 800):
+        engine = new_engine()
+        monsters = add_monsters(engine, count)
+        engine.player.fighter.max_hp = engine.player.fighter.hp = 10 ** 9
+        everyone_chases(engine)
+
+        results = []
+        for batch in (False, True):
+            run = copy.deepcopy(engine)
+            run.batch_enemy_turns = batch
+            start = time.perf_counter()
+            for _ in range(turns):
+                run.handle_enemy_turns()
+            results.append((time.perf_counter() - start) * 1000 / turns)
+        print(f"{len(monsters):>8} {results[0]:>19.2f} {results[1]:>16.2f}")
+
+
+def main() -> None:
+    path_work()
+    print()
+    turn_throughput()
+
+
+if __name__ == "__main__":
+    main()
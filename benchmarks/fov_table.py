@@ -0,0 +1,57 @@
+"""
+cost of one player view at radius 8: computed over the whole map, computed
+over the window around the player, and looked up in a finished FovTable
+"""
+from __future__ import annotations
+
+import random
+import time
+
+import numpy as np
+from tcod.map import compute_fov
+
+from benchmarks.common import big_floor, new_engine
+from fov_table import FovTable
+
+
+def per_call(func, cells) -> float:
+    start = time.perf_counter()
+    for x, y in cells:
+        func(x, y)
+    return (time.perf_counter() - start) / len(cells)
+
+
+def main() -> None:
+    engine = new_engine()
+    for width, height, rooms in ((80, 43, 30), (200, 200, 200), (400, 400, 800)):
+        if (width, height) != (80, 43):
+            big_floor(engine, width, height, rooms)
+        game_map = engine.game_map
+        transparent = game_map.transparent
+        xs, ys = np.nonzero(game_map.walkable)
+        cells = list(zip(xs.tolist(), ys.tolist()))
+        random.seed(0)
+        sample = random.sample(cells, min(2000, len(cells)))
+
+        table = FovTable(transparent, 8, capacity=len(cells))
+        start = time.perf_counter()
+        table.start(game_map.walkable, (engine.player.x, engine.player.y))
+        table.worker.join()
+        build = time.perf_counter() - start
+        packed_bytes = sum(view.nbytes for view in table.views.values())
+
+        full = per_call(lambda x, y: compute_fov(transparent, (x, y), radius=8), sample)
+        window = per_call(table.compute, sample)
+        lookup = per_call(table.get, sample)
+        print(
+            f"{width}x{height}: {len(cells)} cells, table built in {build * 1000:.0f} ms, "
+            f"{packed_bytes / 1024:.0f} KiB packed"
+        )
+        print(
+            f"  full map {full * 1e6:7.1f} us  window {window * 1e6:7.1f} us  "
+            f"lookup {lookup * 1e6:7.1f} us"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+bytes each kind of entity, corpse and message log entry keeps alive,
+measured with tracemalloc over many copies
+
+kept is everything making one allocates, map bookkeeping included
+slots is just the objects it is made of, dict is the same objects rebuilt
+out of plain classes that keep their attributes in a __dict__, the way they
+were before __slots__
+"""
+from __future__ import annotations
+
+import tracemalloc
+from functools import lru_cache
+from typing import Callable, Dict, List
+
+from benchmarks.common import new_engine
+import entity_factories
+from message_log import Message
+from slotted import Slotted, all_slots
+
+
+def bytes_each(make: Callable[[], object], count: int = 2000) -> float:
+    keep: List[object] = []
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        for _ in range(count):
+            keep.append(make())
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    return (after - before) / count
+
+
+@lru_cache(maxsize=None)
+def unslotted(cls: type) -> type:
+    """stand in for a slotted class that keeps its attributes in a __dict__"""
+    return type(cls.__name__, (), {})
+
+
+def rebuild(value: object, with_dict: bool, memo: Dict[int, object]) -> object:
+    """copy of the slotted objects reachable from value, anything else is shared"""
+    if isinstance(value, list):
+        return [rebuild(item, with_dict, memo) for item in value]
+    if not isinstance(value, Slotted):
+        return value
+    if id(value) in memo:  # parents and the components flyweights share
+        return memo[id(value)]
+    cls = type(value)
+    copy = object.__new__(unslotted(cls) if with_dict else cls)
+    memo[id(value)] = copy
+    for name in all_slots(cls):
+        if hasattr(value, name):
+            attribute = rebuild(getattr(value, name), with_dict, memo)
+            if with_dict:
+                copy.__dict__[name] = attribute
+            else:
+                object.__setattr__(copy, name, attribute)
+    return copy
+
+
+def rebuilt_bytes(objects: List[object], with_dict: bool) -> float:
+    """bytes each the slotted objects take once rebuilt, with or without a __dict__"""
+    memo: Dict[int, object] = {}
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        keep = [rebuild(value, with_dict, memo) for value in objects]
+        del memo  # only the copies should count
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del keep
+    return (after - before) / len(objects)
+
+
+def main() -> None:
+    engine = new_engine()
+    game_map = engine.game_map
+    x, y = engine.player.x, engine.player.y
+
+    def corpse():
+        orc = entity_factories.orc.spawn(game_map, x, y)
+        orc.fighter.die()
+        return orc
+
+    engine.player.fighter.max_hp = engine.player.fighter.hp = 10 ** 9
+    rows = [
+        ("player", lambda: entity_factories.player.clone()),
+        ("orc", lambda: entity_factories.orc.spawn(game_map, x, y)),
+        ("corpse", corpse),
+        ("health potion", lambda: entity_factories.health_potion.spawn(game_map, x, y)),
+        ("sword", lambda: entity_factories.sword.spawn(game_map, x, y)),
+        ("message", lambda: Message("The Orc attacks Player for 3 hit points", (255, 255, 255))),
+    ]
+    print(f"{'':14} {'kept':>7} {'slots':>7} {'dict':>7}")
+    for label, make in rows:
+        objects = [make() for _ in range(2000)]
+        print(
+            f"{label:14} {bytes_each(make):7.0f} {rebuilt_bytes(objects, False):7.0f}"
+            f" {rebuilt_bytes(objects, True):7.0f} bytes"
+        )
+
+
+if __name__ == "__main__":
+    main()
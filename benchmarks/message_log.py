@@ -0,0 +1,50 @@
+"""
+memory held and pickled size of a message log as a game goes on,
+with every message kept in the list against the bounded log with its archive
+"""
+from __future__ import annotations
+
+import pickle
+import random
+import tracemalloc
+from typing import Tuple
+
+from message_log import MessageLog
+
+TEXTS = [
+    "The Orc attacks Player for 3 hit points.",
+    "Player attacks Troll but does no damage.",
+    "You picked up the Health Potion!",
+    "Orc is dead!",
+    "You descend the staircase.",
+]
+
+
+def measure(count: int, bounded: bool) -> Tuple[float, int]:
+    random.seed(0)
+    tracemalloc.start()
+    try:
+        log = MessageLog()
+        if not bounded:
+            log.capacity = count + log.segment_size  # never spills
+        for i in range(count):
+            log.add_message(f"{random.choice(TEXTS)} ({i})")
+        held = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    return held, len(pickle.dumps(log, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+def main() -> None:
+    for count in (1_000, 10_000, 100_000, 500_000):
+        for bounded in (False, True):
+            held, saved = measure(count, bounded)
+            label = "archive" if bounded else "list"
+            print(
+                f"{count:7} messages {label:7}: {held / 1024:8.0f} KiB held, "
+                f"{saved / 1024:8.0f} KiB pickled"
+            )
+
+
+if __name__ == "__main__":
+    main()
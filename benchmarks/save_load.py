@@ -0,0 +1,55 @@
+"""
+save and load time and file size, the old pickled Engine compressed with lzma
+against save_format, on a fresh floor 1 and on a long game with a big floor
+"""
+from __future__ import annotations
+
+import lzma
+import pickle
+import random
+
+from benchmarks.common import add_monsters, big_floor, descend, new_engine, timeit
+import entity_factories
+from engine import Engine
+import save_format
+
+
+def long_game() -> Engine:
+    engine = new_engine()
+    descend(engine, 10)
+    big_floor(engine, 200, 200, 200)
+    add_monsters(engine, 400)
+    add_monsters(engine, 200, entity_factories.troll)
+    for actor in list(engine.game_map.actors)[:150]:
+        if actor is not engine.player:
+            actor.fighter.hp = 0  # leaves a corpse
+    game_map = engine.game_map
+    game_map.explored[:] = game_map.walkable
+    random.seed(0)
+    for i in range(30000):
+        engine.message_log.add_message(f"The Orc attacks Player for {random.randint(1, 9)} hit points.")
+    return engine
+
+
+def legacy_dumps(engine: Engine) -> bytes:
+    return lzma.compress(pickle.dumps(engine))
+
+
+def main() -> None:
+    for label, engine in (("floor 1", new_engine()), ("floor 10, 200x200", long_game())):
+        print(f"{label}: {len(engine.game_map.entities)} entities, {len(engine.message_log)} messages")
+        for name, dumps, loads in (
+                ("pickle+lzma", legacy_dumps, save_format.loads_legacy),
+                ("save_format", save_format.dumps, save_format.loads),
+        ):
+            data = dumps(engine)
+            save = timeit(lambda: dumps(engine))
+            load = timeit(lambda: loads(data))
+            print(
+                f"  {name:12} save {save * 1000:7.1f} ms  load {load * 1000:7.1f} ms  "
+                f"{len(data) / 1024:7.1f} KiB"
+            )
+
+
+if __name__ == "__main__":
+    main()
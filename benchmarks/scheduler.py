@@ -0,0 +1,47 @@
+"""
+raw TurnScheduler throughput: scheduled turns per second for large actor counts
+with a mix of speeds, nothing is drawn and the actors do no work
+"""
+from __future__ import annotations
+
+import random
+import time
+
+from scheduler import TurnScheduler, action_time
+
+
+class Dummy:
+    """stand in actor, the scheduler only needs a hashable object with a speed"""
+
+    def __init__(self, speed: int):
+        self.speed = speed
+
+
+def run(count: int, player_turns: int) -> float:
+    """scheduled turns per second"""
+    random.seed(0)
+    scheduler = TurnScheduler()
+    for _ in range(count):
+        scheduler.add(Dummy(random.choice((50, 100, 100, 100, 150, 200))))
+
+    turns = 0
+    start = time.perf_counter()
+    for _ in range(player_turns):
+        scheduler.advance(100)
+        due = scheduler.pop_due()
+        while due:
+            turns += len(due)
+            for when, actor in due:
+                scheduler.schedule(actor, when + action_time(actor))
+            due = scheduler.pop_due()
+    return turns / (time.perf_counter() - start)
+
+
+def main() -> None:
+    print(f"{'actors':>8} {'turns/s':>12}")
+    for count in (1_000, 10_000, 100_000):
+        print(f"{count:>8} {run(count, 20):>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
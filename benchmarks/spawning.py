@@ -0,0 +1,69 @@
+"""
+generate floors 1 to 10 and report the time and memory spent spawning
+entities, with the clone constructors against the old deepcopy of prototypes
+"""
+from __future__ import annotations
+
+import copy
+import time
+import tracemalloc
+
+from benchmarks.common import new_engine
+from entity import Entity
+
+
+def deepcopy_spawn(self, gamemap, x: int, y: int):
+    """Entity.spawn as it was before the clone constructors"""
+    clone = copy.deepcopy(self)
+    clone.x = x
+    clone.y = y
+    clone.parent = gamemap
+    gamemap.add_entity(clone)
+    return clone
+
+
+def run(seed: int = 0):
+    """returns (entities spawned, seconds spent spawning, bytes kept per entity)"""
+    engine = new_engine(seed)
+    spawn = Entity.spawn
+    totals = {"count": 0, "seconds": 0.0, "bytes": 0}
+    keep = []  # the maps get replaced on every floor, hold on to the spawns
+
+    def measured_spawn(self, gamemap, x, y):
+        before = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+        clone = spawn(self, gamemap, x, y)
+        totals["seconds"] += time.perf_counter() - start
+        totals["bytes"] += tracemalloc.get_traced_memory()[0] - before
+        totals["count"] += 1
+        keep.append(clone)
+        return clone
+
+    Entity.spawn = measured_spawn
+    tracemalloc.start()
+    try:
+        while engine.game_world.current_floor < 10:
+            engine.game_world.generate_floor()
+    finally:
+        tracemalloc.stop()
+        Entity.spawn = spawn
+    return totals["count"], totals["seconds"], totals["bytes"] / max(1, totals["count"])
+
+
+def main() -> None:
+    spawn = Entity.spawn
+    Entity.spawn = deepcopy_spawn
+    try:
+        old = run()
+    finally:
+        Entity.spawn = spawn
+    new = run()
+    for label, (count, seconds, per_entity) in (("deepcopy", old), ("clone", new)):
+        print(
+            f"{label:9} {count:5} entities  {seconds * 1000:7.1f} ms spawning"
+            f"  {seconds / count * 1e6:6.1f} us each  {per_entity:7.0f} bytes each"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -3,7 +3,6 @@ from __future__ import annotations
 import random
 from typing import List, Tuple, TYPE_CHECKING, Optional
 import color
-import numpy as np
 import tcod
 
 from actions import Action, MeleeAction, MovementAction, WaitAction, BumpAction, RangedAction
@@ -11,28 +10,50 @@ from actions import Action, MeleeAction, MovementAction, WaitAction, BumpAction,
 if TYPE_CHECKING:
     from entity import Actor
 
+directions = [
+    (-1, -1,), #NW
+    (0, -1,), #N
+    (1, -1), #NE
+    (-1, 0), #W
+    (1, 0), #E
+    (-1, 1), #SW
+    (0, 1), #S
+    (1, 1), #SE
+]
+
 class BaseAI(Action):
     entity: Actor
+    # how far away the player can be attacked from, 0 means this ai never attacks
+    attack_range = 0
 
     def perform(self) -> None:
         raise NotImplementedError()
 
+    def clone(self, entity: Actor) -> BaseAI:
+        """the same ai for a freshly spawned entity"""
+        clone = object.__new__(type(self))
+        clone.__dict__.update(self.__dict__)
+        clone.entity = entity
+        return clone
+
+    @property
+    def can_sleep(self) -> bool:
+        """true if this ai has nothing to do while the player is far away"""
+        return False
+
+    def act(
+            self, distance: int, sees_target: bool, step: Optional[Tuple[int, int]] = None
+    ) -> None:
+        """perform with the decisions from a batched enemy turn, ignored by default"""
+        return self.perform()
+
     def get_path_to(self, dest_x: int, dest_y:int)->List[Tuple[int,int]]:
         """
         Compute anr return a path to the target position,
         if there is no valid path return an empty list
         """
-        # copy walkable tile array
-        cost = np.array(self.entity.gamemap.tiles["walkable"], dtype=np.int8)
-
-        for entity in self.entity.gamemap.entities:
-            #check that an entity blocks movement and cost isnt zero (blocking)
-            if entity.blocks_movement and cost[entity.x, entity.y]:
-                # add to the cost of blocked position
-                # a lower number means more enemies will crowd behind each other in
-                # hallways. A higher number means enemies will take
-                # longer paths in order ot surround the player
-                cost[entity.x, entity.y] += 10
+        # walkable tiles with extra cost where entities block movement
+        cost = self.entity.gamemap.movement_cost
 
         # create a graph frm the cost array and pass that to a new pathfinder
         graph = tcod.path.SimpleGraph(cost=cost, cardinal=2, diagonal=3)
@@ -86,20 +107,65 @@ class PowerModifier(DefenseModifier):
             self.turns_remaining -= 1
 
 class HostileEnemy(BaseAI):
+    attack_range = 1
+    # where the target was when last chased with a planned step
+    last_seen_xy: Optional[Tuple[int, int]] = None
+
     def __init__(self, entity: Actor):
         super().__init__(entity)
         self.path: List[Tuple[int, int]] = []
 
+    def clone(self, entity: Actor) -> HostileEnemy:
+        clone = super().clone(entity)
+        clone.path = list(self.path)
+        return clone
+
     def perform(self) -> None:
         target = self.engine.player
         dx = target.x - self.entity.x
         dy = target.y - self.entity.y
         distance = max(abs(dx), abs(dy)) #chebyshev distance. I don't really know
 
-        if self.engine.game_map.visible[self.entity.x, self.entity.y]:
-            if distance <= 1:
-                return MeleeAction(self.entity, dx, dy).perform()
-            self.path = self.get_path_to(target.x, target.y)
+        return self.act(distance, self.engine.game_map.actor_sees_player(self.entity))
+
+    @property
+    def can_sleep(self) -> bool:
+        return not self.path and not self.last_seen_xy
+
+    def attack(self, dx: int, dy: int) -> None:
+        return MeleeAction(self.entity, dx, dy).perform()
+
+    def act(
+            self, distance: int, sees_target: bool, step: Optional[Tuple[int, int]] = None
+    ) -> None:
+        """
+        take this turn given the chebyshev distance to the player and if it can see the player
+        'step' is the move planned by Engine.plan_enemy_turns, None when acting alone
+        """
+        target = self.engine.player
+
+        if sees_target:
+            if distance <= self.attack_range:
+                return self.attack(target.x - self.entity.x, target.y - self.entity.y)
+            if step is None:
+                # downhill on the distance map all chasing monsters share
+                self.path = self.engine.game_map.path_to_player(self.entity.x, self.entity.y)
+                self.last_seen_xy = None
+            else:
+                # chase with the planned step, a path is only needed once the target is lost
+                self.path = []
+                self.last_seen_xy = target.x, target.y
+                game_map = self.engine.game_map
+                x, y = self.entity.x + step[0], self.entity.y + step[1]
+                if step != (0, 0) and game_map.blockers[x, y]:
+                    # a monster that moved earlier this turn took the tile, go around it
+                    step = game_map.downhill_step(self.entity.x, self.entity.y)
+                if step == (0, 0):
+                    return WaitAction(self.entity).perform()
+                return MovementAction(self.entity, *step).perform()
+        elif not self.path and self.last_seen_xy:
+            self.path = self.get_path_to(*self.last_seen_xy)
+            self.last_seen_xy = None
 
         if self.path:
             dest_x, dest_y = self.path.pop(0)
@@ -115,24 +181,12 @@ class RangedEnemy(HostileEnemy):
         self.range = range
         self.path: List[Tuple[int, int]] = []
 
-    def perform(self) -> None:
-        target = self.engine.player
-        dx = target.x - self.entity.x
-        dy = target.y - self.entity.y
-        distance = max(abs(dx), abs(dy))  # chebyshev distance. I don't really know
-
-        if self.engine.game_map.visible[self.entity.x, self.entity.y]:
-            if distance <= self.range:
-                return RangedAction(self.entity, dx, dy).perform()
-            self.path = self.get_path_to(target.x, target.y)
-
-        if self.path:
-            dest_x, dest_y = self.path.pop(0)
-            return MovementAction(
-                self.entity, dest_x - self.entity.x, dest_y - self.entity.y,
-            ).perform()
+    @property
+    def attack_range(self) -> int:
+        return self.range
 
-        return WaitAction(self.entity).perform()
+    def attack(self, dx: int, dy: int) -> None:
+        return RangedAction(self.entity, dx, dy).perform()
 
 class ConfusedEnemy(BaseAI):
     """confused enemy will stumble aimlessly for a given number
@@ -157,18 +211,7 @@ class ConfusedEnemy(BaseAI):
             self.entity.ai = self.previous_ai
         else:
             #pick a random direction
-            direction_x, direction_y = random.choice(
-                [
-                    (-1, -1,), #NW
-                    (0, -1,), #N
-                    (1, -1), #NE
-                    (-1, 0), #W
-                    (1, 0), #E
-                    (-1, 1), #SW
-                    (0, 1), #S
-                    (1, 1), #SE
-                ]
-            )
+            direction_x, direction_y = random.choice(directions)
             self.turns_remaining -=1
 
             # The actor will either try to move or attack in the chosen random direction.
@@ -1,18 +1,32 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from typing import TypeVar, TYPE_CHECKING
+
+from slotted import Slotted
 
 if TYPE_CHECKING:
     from engine import Engine
     from entity import Entity
     from game_map import GameMap
 
-class BaseComponent:
+C = TypeVar("C", bound="BaseComponent")
+
+class BaseComponent(Slotted):
+    __slots__ = ("parent",)
     parent: Entity #owning entity instance
 
     @property
     def gamemap(self)-> GameMap:
         return self.parent.gamemap
+    def clone(self: C, parent: Entity) -> C:
+        """
+        copy for a freshly spawned entity, plain values are shared with this one
+        components that hold lists or other entities copy those themselves
+        """
+        clone = self.shallow_copy()
+        clone.parent = parent
+        return clone
+
     @property
     def engine(self) -> Engine:
         return self.gamemap.engine ## entity engine
\ No newline at end of file
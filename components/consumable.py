@@ -18,6 +18,7 @@ if TYPE_CHECKING:
     from entity import Actor, Item
 
 class Consumable(BaseComponent):
+    __slots__ = ()
     parent: Item
 
     def get_action(self, consumer: Actor) -> Optional[ActionOrHandler]:
@@ -36,6 +37,8 @@ class Consumable(BaseComponent):
             inventory.items.remove(entity)
 
 class ConfusionConsumable(Consumable):
+    __slots__ = ("number_of_turns",)
+
     def __init__(self, number_of_turns: int):
         self.number_of_turns = number_of_turns
 
@@ -69,6 +72,8 @@ class ConfusionConsumable(Consumable):
         self.consume()
 
 class BeamConsumable(Consumable):
+    __slots__ = ("damage",)
+
     def __init__(self, damage: int):
         self.damage = damage
 
@@ -102,6 +107,8 @@ class BeamConsumable(Consumable):
         self.consume()
 
 class BowConsumable(Consumable):
+    __slots__ = ("damage",)
+
     def __init__(self, damage: int):
         self.damage = damage
 
@@ -135,6 +142,8 @@ class BowConsumable(Consumable):
         self.consume()
 
 class HealingConsumable(Consumable):
+    __slots__ = ("amount",)
+
     def __init__(self, amount: int):
         self.amount = amount
 
@@ -152,6 +161,8 @@ class HealingConsumable(Consumable):
             raise Impossible(f"Your health is already full.")
 
 class TrickHealing(HealingConsumable):
+    __slots__ = ()
+
     def activate(self, action: actions.ItemAction) -> None:
         consumer = action.entity
         amount_recovered = consumer.fighter.heal(self.amount)
@@ -161,6 +172,8 @@ class TrickHealing(HealingConsumable):
         )
         self.consume()
 class DefenseConsumable(Consumable):
+    __slots__ = ("amount", "number_of_turns")
+
     def __init__(
             self,
             amount: int,
@@ -199,6 +212,8 @@ class DefenseConsumable(Consumable):
             )
 
 class PowerConsumable(DefenseConsumable):
+    __slots__ = ()
+
     def activate(self, action: actions.ItemAction) -> None:
         consumer = action.entity
         if not isinstance(consumer.ai, components.ai.DefenseModifier) or not isinstance(consumer.ai, components.ai.PowerModifier):
@@ -229,6 +244,8 @@ class PowerConsumable(DefenseConsumable):
             )
 
 class FireballDamageConsumable(Consumable):
+    __slots__ = ("damage", "radius")
+
     def __init__(self, damage: int, radius: int):
         self.damage = damage
         self.radius = radius
@@ -250,18 +267,19 @@ class FireballDamageConsumable(Consumable):
             raise Impossible("You cannot target an area that you cannot see")
 
         target_hit = False
-        for actor in self.engine.game_map.actors:
-            if actor.distance(*target_xy) <= self.radius:
-                self.engine.message_log.add_message(
-                    f"The {actor.name} is engulfed in a fiery explosion, taking {self.damage} damage"
-                )
-                actor.fighter.take_damage(self.damage)
-                target_hit = True
+        for actor in self.engine.game_map.actors_in_radius(*target_xy, self.radius):
+            self.engine.message_log.add_message(
+                f"The {actor.name} is engulfed in a fiery explosion, taking {self.damage} damage"
+            )
+            actor.fighter.take_damage(self.damage)
+            target_hit = True
         if not target_hit:
             raise Impossible("There are no targets in the radius")
         self.consume()
 
 class TimeStopConsumable(Consumable):
+    __slots__ = ("number_of_turns", "radius")
+
     def __init__(self, number_of_turns: int, radius: int):
         self.number_of_turns = number_of_turns
         self.radius = radius
@@ -283,39 +301,33 @@ class TimeStopConsumable(Consumable):
         if not self.engine.game_map.visible[target_xy]:
             raise Impossible("You cannot target an area that you cannot see")
 
-        for actor in self.engine.game_map.actors:
-            if actor.distance(*target_xy) <= self.radius:
-                if (actor.name != "Player"):
-                    self.engine.message_log.add_message(
-                        f"The {actor.name} is stuck in the sands of time, for {self.number_of_turns} turns!"
-                    )
-                    actor.ai = components.ai.TimeStopAI(
-                        entity=actor,
-                        previous_ai=actor.ai,
-                        turns_remaining=self.number_of_turns,
-                    )
-                    target_hit = True
+        for actor in self.engine.game_map.actors_in_radius(*target_xy, self.radius):
+            if (actor.name != "Player"):
+                self.engine.message_log.add_message(
+                    f"The {actor.name} is stuck in the sands of time, for {self.number_of_turns} turns!"
+                )
+                actor.ai = components.ai.TimeStopAI(
+                    entity=actor,
+                    previous_ai=actor.ai,
+                    turns_remaining=self.number_of_turns,
+                )
+                target_hit = True
         if not target_hit:
             raise Impossible("There are no targets in the radius")
         self.consume()
 
 class LightningDamageConsumable(Consumable):
+    __slots__ = ("damage", "max_range")
+
     def __init__(self, damage: int, max_range: int):
         self.damage = damage
         self.max_range = max_range
 
     def activate(self, action: actions.ItemAction) -> None:
         consumer = action.entity
-        target = None
-        closest_distance = self.max_range + 1.0
-
-        for actor in self.engine.game_map.actors:
-            if actor is not consumer and self.parent.gamemap.visible[actor.x, actor.y]:
-                distance = consumer.distance(actor.x, actor.y)
-
-                if distance < closest_distance:
-                    target = actor
-                    closest_distance = distance
+        target = self.engine.game_map.nearest_visible_actor(
+            consumer.x, consumer.y, self.max_range, exclude=consumer
+        )
 
         if target:
             self.engine.message_log.add_message(
@@ -331,6 +343,8 @@ The Staffs here are pseudo consumables.
 They hold the same function in inventory, but they are reusable items that won't dissappear after one use
 """
 class Staff(Consumable):
+    __slots__ = ("damage",)
+
     def __init__(self, damage: int):
         self.damage = damage
 
@@ -360,6 +374,8 @@ class Staff(Consumable):
         target.fighter.take_damage(self.damage)
 
 class ExplosiveStaff(Consumable):
+    __slots__ = ("damage", "radius")
+
     def __init__(self, damage: int, radius: int):
         self.damage = damage
         self.radius = radius
@@ -382,17 +398,18 @@ class ExplosiveStaff(Consumable):
         if not self.engine.game_map.visible[target_xy]:
             raise Impossible("You cannot target an area that you cannot see")
 
-        for actor in self.engine.game_map.actors:
-            if actor.distance(*target_xy) <= self.radius:
-                self.engine.message_log.add_message(
-                    f"An explosive ball of magic launches from the staff to strike {actor.name}, taking {self.damage} damage"
-                )
-                actor.fighter.take_damage(self.damage)
-                target_hit = True
+        for actor in self.engine.game_map.actors_in_radius(*target_xy, self.radius):
+            self.engine.message_log.add_message(
+                f"An explosive ball of magic launches from the staff to strike {actor.name}, taking {self.damage} damage"
+            )
+            actor.fighter.take_damage(self.damage)
+            target_hit = True
         if not target_hit:
             raise Impossible("There are no targets in the radius")
 
 class EndStaff(Consumable):
+    __slots__ = ("damage", "radius")
+
     def __init__(self, damage: int, radius: int):
         self.damage = damage
         self.radius = radius
@@ -415,18 +432,17 @@ class EndStaff(Consumable):
         if not self.engine.game_map.visible[target_xy]:
             raise Impossible("You cannot target an area that you cannot see")
 
-        for actor in self.engine.game_map.actors:
-            if actor.distance(*target_xy) <= self.radius:
-                self.engine.message_log.add_message(
-                    f"Staggering mythic power unlike you have ever seen flies from the staff to strike {actor.name}, "
-                    f"taking {self.damage} damage and dazing them!"
-                )
-                actor.fighter.take_damage(self.damage)
-                actor.ai = components.ai.ConfusedEnemy(
-                    entity=actor,
-                    previous_ai=actor.ai,
-                    turns_remaining=1,
-                )
-                target_hit = True
+        for actor in self.engine.game_map.actors_in_radius(*target_xy, self.radius):
+            self.engine.message_log.add_message(
+                f"Staggering mythic power unlike you have ever seen flies from the staff to strike {actor.name}, "
+                f"taking {self.damage} damage and dazing them!"
+            )
+            actor.fighter.take_damage(self.damage)
+            actor.ai = components.ai.ConfusedEnemy(
+                entity=actor,
+                previous_ai=actor.ai,
+                turns_remaining=1,
+            )
+            target_hit = True
         if not target_hit:
             raise Impossible("There are no targets in the radius")
\ No newline at end of file
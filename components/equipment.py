@@ -10,12 +10,25 @@ if TYPE_CHECKING:
 
 
 class Equipment(BaseComponent):
+    __slots__ = ("weapon", "armor")
+    # shared by every monster spawned from a prototype that carries nothing, with
+    # the prototype as parent, so only equip and unequip through the player
     parent: Actor
 
     def __init__(self, weapon: Optional[Item] = None, armor: Optional[Item] = None):
         self.weapon = weapon
         self.armor = armor
 
+    def clone(self, parent: Actor) -> Equipment:
+        """call after the inventory was cloned, equipped items point at the copies in there"""
+        clone = super().clone(parent)
+        items = self.parent.inventory.items
+        if self.weapon is not None:
+            clone.weapon = parent.inventory.items[items.index(self.weapon)]
+        if self.armor is not None:
+            clone.armor = parent.inventory.items[items.index(self.armor)]
+        return clone
+
     @property
     def defense_bonus(self) -> int:
         bonus = 0
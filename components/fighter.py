@@ -9,6 +9,7 @@ if TYPE_CHECKING:
     from entity import Actor
 
 class Fighter(BaseComponent):
+    __slots__ = ("max_hp", "_hp", "base_defense", "base_power")
     parent: Actor
     def __init__(self, hp: int, base_defense: int, base_power: int):
         self.max_hp = hp
@@ -56,6 +57,15 @@ class Fighter(BaseComponent):
             death_message = f"{self.parent.name} is dead!"
             death_message_color = color.enemy_die
 
+        self.leave_corpse()
+        self.gamemap.entity_died(self.parent)
+
+        self.engine.message_log.add_message(death_message, death_message_color)
+
+        self.engine.player.level.add_xp(self.parent.level.xp_given)
+
+    def leave_corpse(self) -> None:
+        """turn the parent into its remains, save_format does this to saved corpses too"""
         self.parent.char = "%"
         self.parent.color = (191, 0, 0)
         self.parent.blocks_movement = False
@@ -63,10 +73,6 @@ class Fighter(BaseComponent):
         self.parent.name = f"remains of {self.parent.name}"
         self.parent.render_order = RenderOrder.CORPSE
 
-        self.engine.message_log.add_message(death_message, death_message_color)
-
-        self.engine.player.level.add_xp(self.parent.level.xp_given)
-
     def heal(self, amount: int)->int:
         if self._hp == self.max_hp:
             return 0
@@ -8,12 +8,20 @@ if TYPE_CHECKING:
     from  entity import Actor, Item
 
 class Inventory(BaseComponent):
+    __slots__ = ("capacity", "items")
+    # monsters with capacity 0 all share their prototype's inventory, see Actor.clone,
+    # so there parent is the prototype, which sits on no map: only the player drops
     parent: Actor
 
     def __init__(self, capacity: int):
         self.capacity = capacity
         self.items: List[Item] = []
 
+    def clone(self, parent: Actor) -> Inventory:
+        clone = super().clone(parent)
+        clone.items = [item.clone(clone) for item in self.items]
+        return clone
+
     def drop(self, item: Item) -> None:
         """
         removes item from inventory and restores it ot game map at player location
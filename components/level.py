@@ -8,6 +8,11 @@ if TYPE_CHECKING:
     from entity import Actor
 
 class Level(BaseComponent):
+    __slots__ = (
+        "current_level", "current_xp", "level_up_base", "level_up_factor", "xp_given"
+    )
+    # monsters that carry nothing share one level with their prototype, which is the
+    # parent, so increase_* would raise the prototype's stats, only the player levels up
     parent: Actor
 
     def __init__(
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+from typing import Dict, List, Set, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from entity import Actor
+    from game_map import GameMap
+
+
+class Dormancy:
+    """
+    puts monsters far from the player to sleep so enemy turns skip them
+    sleepers are bucketed by map chunk, so waking only looks near the player
+    """
+
+    def __init__(self, activation_radius: int = 20, chunk_size: int = 8):
+        # monsters inside this chebyshev radius can hear the player and wake up
+        # keep it at least as big as the fov radius so sight also wakes them
+        self.activation_radius = activation_radius
+        self.chunk_size = chunk_size
+        self.awake: Set[Actor] = set()
+        self.sleeping: Dict[Tuple[int, int], Set[Actor]] = {}
+
+    def __len__(self) -> int:
+        """number of sleeping monsters"""
+        return sum(len(sleepers) for sleepers in self.sleeping.values())
+
+    def chunk(self, x: int, y: int) -> Tuple[int, int]:
+        return x // self.chunk_size, y // self.chunk_size
+
+    def add(self, actor: Actor) -> None:
+        """new monsters start awake, they fall asleep on the next update if far away"""
+        self.awake.add(actor)
+
+    def discard(self, actor: Actor) -> None:
+        """forget a monster that died or left the map"""
+        if actor in self.awake:
+            self.awake.remove(actor)
+            return
+        # sleepers never move, so their chunk is where they stand
+        sleepers = self.sleeping.get(self.chunk(actor.x, actor.y))
+        if sleepers is not None:
+            sleepers.discard(actor)
+
+    def update(
+            self, game_map: GameMap, x: int, y: int
+    ) -> Tuple[List[Actor], List[Actor]]:
+        """
+        wake monsters that can hear or see (x, y), and put far away idle ones to sleep
+        returns the monsters that woke up and the ones that fell asleep
+        """
+        radius = self.activation_radius
+        visible = game_map.visible
+        woken_up: List[Actor] = []
+
+        low_x, low_y = self.chunk(max(0, x - radius), max(0, y - radius))
+        high_x, high_y = self.chunk(
+            min(game_map.width - 1, x + radius), min(game_map.height - 1, y + radius)
+        )
+        for chunk_x in range(low_x, high_x + 1):
+            for chunk_y in range(low_y, high_y + 1):
+                sleepers = self.sleeping.get((chunk_x, chunk_y))
+                if not sleepers:
+                    continue
+                woken = [
+                    actor for actor in sleepers
+                    if max(abs(actor.x - x), abs(actor.y - y)) <= radius
+                    or visible[actor.x, actor.y]
+                ]
+                sleepers.difference_update(woken)
+                self.awake.update(woken)
+                woken_up += woken
+
+        fallen_asleep = [
+            actor for actor in self.awake
+            if max(abs(actor.x - x), abs(actor.y - y)) > radius
+            and not visible[actor.x, actor.y]
+            and actor.ai is not None
+            and actor.ai.can_sleep
+        ]
+        for actor in fallen_asleep:
+            self.awake.remove(actor)
+            self.sleeping.setdefault(self.chunk(actor.x, actor.y), set()).add(actor)
+        return woken_up, fallen_asleep
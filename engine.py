@@ -1,18 +1,18 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, List, Optional, Tuple
 
+import numpy as np
 from tcod.console import Console
-from tcod.map import compute_fov
 
 from entity import Actor
 from game_map import GameMap
 import exceptions
 from message_log import MessageLog
-import render_functions
-import lzma
-import pickle
+from renderer import LayeredRenderer
+from scheduler import action_time
 if TYPE_CHECKING:
+    from autosave import Autosaver
     from entity import Actor
     from game_map import GameMap, GameWorld
 
@@ -20,6 +20,23 @@ if TYPE_CHECKING:
 class Engine:
     game_map: GameMap
     game_world: GameWorld
+    # decide every monster's turn in one vectorized pass, see plan_enemy_turns
+    batch_enemy_turns = True
+    # look the player's view up in a table of views built on a worker thread
+    precompute_fov = False
+    _renderer: Optional[LayeredRenderer] = None
+    # a save_codecs preset, trades save and load time against file size
+    save_codec = "zlib"
+    # saves in the background as the game goes, set up by the main menu
+    autosaver: Optional[Autosaver] = None
+    turns = 0  # player turns taken, shown in the main menu
+
+    def __getstate__(self) -> dict:
+        """the renderer only holds buffers, it is rebuilt after loading"""
+        state = self.__dict__.copy()
+        state.pop("_renderer", None)
+        state.pop("autosaver", None)
+        return state
 
     def __init__(self, player: Actor):
         self.message_log = MessageLog()
@@ -27,48 +44,108 @@ class Engine:
         self.player = player
 
     def handle_enemy_turns(self) -> None:
-        for entity in set(self.game_map.actors) - {self.player}:
+        """let every monster whose turn has come act, the player's action took its action time"""
+        game_map = self.game_map
+        # the player may have moved, monsters share one fresh distance map
+        game_map.invalidate_player_distance()
+        scheduler = game_map.scheduler
+        dormancy = game_map.dormancy
+        # sleeping monsters far from the player are skipped entirely
+        woken, fallen_asleep = dormancy.update(game_map, self.player.x, self.player.y)
+        for actor in woken:
+            scheduler.add(actor)
+        for actor in fallen_asleep:
+            scheduler.discard(actor)
+
+        scheduler.advance(action_time(self.player))
+        # fast monsters can be due again after acting, so keep popping until nobody is
+        due = scheduler.pop_due()
+        while due:
+            self.perform_enemy_turns([actor for _, actor in due])
+            for time, actor in due:
+                if actor.is_alive and actor in dormancy.awake:
+                    scheduler.schedule(actor, time + action_time(actor))
+            due = scheduler.pop_due()
+
+    def perform_enemy_turns(self, monsters: List[Actor]) -> None:
+        """one turn for each monster, in order"""
+        if not self.batch_enemy_turns:
+            for entity in monsters:
+                if entity.ai:
+                    try:
+                        entity.ai.perform()
+                    except exceptions.Impossible:
+                        pass #ignore impossible exceptions from AI
+            return
+
+        distances, sees_player, steps = self.plan_enemy_turns(monsters)
+        for entity, distance, sees, step in zip(
+            monsters, distances.tolist(), sees_player.tolist(), steps.tolist()
+        ):
             if entity.ai:
                 try:
-                    entity.ai.perform()
+                    entity.ai.act(distance, sees, (step[0], step[1]))
                 except exceptions.Impossible:
                     pass #ignore impossible exceptions from AI
 
-    def update_fov(self) -> None:
-        """Recompute visible area based on player's POV"""
-        self.game_map.visible[:] = compute_fov(
-            self.game_map.tiles["transparent"],
-            (self.player.x, self.player.y),
-            radius=8,
+    def plan_enemy_turns(
+            self, monsters: List[Actor]
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        work out every monster's decision at once:
+        chebyshev distance to the player, whether it can see the player,
+        and a (dx, dy) step toward the player for the ones that should chase
+        """
+        count = len(monsters)
+        xs = np.fromiter((monster.x for monster in monsters), dtype=np.intp, count=count)
+        ys = np.fromiter((monster.y for monster in monsters), dtype=np.intp, count=count)
+        attack_ranges = np.fromiter(
+            (monster.ai.attack_range for monster in monsters), dtype=np.intp, count=count
         )
-        # if a tile is "visible" add it to explored
-        self.game_map.explored |= self.game_map.visible
-
-    def render(self, console: Console) -> None:
-        self.game_map.render(console)
-
-        self.message_log.render(console=console, x=21, y=45, width=40, height=5)
-        render_functions.render_bar(
-            console=console,
-            current_value=self.player.fighter.hp,
-            maximum_value=self.player.fighter.max_hp,
-            total_width=20,
+        sight_radii = np.fromiter(
+            (monster.sight_radius for monster in monsters), dtype=np.intp, count=count
         )
 
-        render_functions.render_dungeon_level(
-            console=console,
-            dungeon_level=self.game_world.current_floor,
-            location= (0, 47),
-        )
-        render_functions.render_names_at_mouse_location(
-            console=console, x=21, y=44, engine=self
-        )
+        distances = np.maximum(abs(self.player.x - xs), abs(self.player.y - ys))
+        sees_player = self.game_map.sees_player(xs, ys, sight_radii)
+        chasing = sees_player & (distances > attack_ranges) & (attack_ranges > 0)
+
+        steps = np.zeros((count, 2), dtype=np.intp)
+        if chasing.any():
+            steps[chasing] = self.game_map.downhill_steps(xs[chasing], ys[chasing])
+        return distances, sees_player, steps
+
+    def update_fov(self) -> None:
+        """Recompute visible area based on player's POV, free if the player didnt move"""
+        game_map = self.game_map
+        if self.precompute_fov and game_map.fov_table is None:
+            game_map.start_fov_table(8, (self.player.x, self.player.y))
+        game_map.update_visible(self.player.x, self.player.y, radius=8)
+
+    def render(self, console: Console) -> None:
+        """draw the game screen, layers whose inputs didnt change are reused"""
+        renderer = self._renderer
+        if renderer is None or (renderer.frame.width, renderer.frame.height) != (
+                console.width, console.height
+        ):
+            renderer = self._renderer = LayeredRenderer(console.width, console.height)
+        renderer.render(self, console)
 
     def save_as(self, filename: str) -> None:
-        """Save this Engine instance as a compressed file"""
-        save_data = lzma.compress(pickle.dumps(self))
-        with open(filename, "wb") as f:
-            f.write(save_data)
+        """Save this Engine instance as a compressed file, see save_format"""
+        import save_format
+
+        if self.autosaver is not None:
+            # waits for an autosave in progress and reuses what it compressed
+            self.autosaver.save_now(self, filename)
+        else:
+            save_format.save(self, filename, self.save_codec)
+
+    def stop_autosave(self) -> None:
+        """before the save is deleted, so no autosave in progress writes it again"""
+        if self.autosaver is not None:
+            self.autosaver.close()
+            self.autosaver = None
 
     @property
     def player_at_artifact(self) -> bool:
@@ -1,10 +1,10 @@
 from __future__ import annotations
 
-import copy
 import math
 from typing import Tuple, TypeVar, TYPE_CHECKING, Optional, Type, Union
 
 from render_order import RenderOrder
+from slotted import Slotted
 
 if TYPE_CHECKING:
     from components.ai import BaseAI
@@ -18,9 +18,12 @@ if TYPE_CHECKING:
 
 T = TypeVar("T", bound="Entity")
 
-class Entity:
+class Entity(Slotted):
     """generic object ---> players, enemies, items, etc."""
 
+    __slots__ = (
+        "parent", "x", "y", "char", "color", "name", "blocks_movement", "render_order"
+    )
     parent: Union[GameMap, Inventory]
 
     def __init__(
@@ -44,31 +47,52 @@ class Entity:
         if parent:
             #if gamemap isn't provided it will be set later
             self.parent = parent
-            parent.entities.add(self)
+            parent.add_entity(self)
 
     @property
     def gamemap(self)->GameMap:
         return self.parent.gamemap
 
+    def clone(self: T, parent: Optional[Union[GameMap, Inventory]] = None) -> T:
+        """
+        copy of this entity, used instead of deepcopy to spawn from the prototypes
+        names, glyphs, colors and other plain values are shared, not copied
+        """
+        clone = self.shallow_copy()
+        if parent is not None:
+            clone.parent = parent
+        elif hasattr(clone, "parent"):
+            del clone.parent
+        return clone
+
     def spawn(self: T, gamemap: GameMap, x: int, y: int) -> T:
         """Spawn a copy of this instance at the given location"""
-        clone = copy.deepcopy(self)
+        clone = self.clone()
         clone.x = x
         clone.y = y
         clone.parent = gamemap
-        gamemap.entities.add(clone)
+        gamemap.add_entity(clone)
         return clone
 
     def place(self, x: int, y: int, gamemap: Optional[GameMap] = None) -> None:
         """Place this entity at a new location. handles moving across gamemaps"""
-        self.x = x
-        self.y = y
         if gamemap:
             if hasattr(self, "parent"): ## potential to be uninit
                 if self.parent is self.gamemap:
-                    self.gamemap.entities.remove(self)
+                    self.gamemap.remove_entity(self)
+            if self in gamemap.entities:
+                # already listed on the new map, like the player passed to GameMap()
+                gamemap.remove_entity(self)
+            self.x = x
+            self.y = y
             self.parent = gamemap
-            gamemap.entities.add(self)
+            gamemap.add_entity(self)
+        else:
+            old_x, old_y = self.x, self.y
+            self.x = x
+            self.y = y
+            if hasattr(self, "parent") and self.parent is self.gamemap:
+                self.gamemap.entity_moved(self, old_x, old_y)
 
     def distance(self, x: int, y: int) -> float:
         """
@@ -81,8 +105,11 @@ class Entity:
     def move(self, dx: int, dy: int) -> None:
         self.x += dx
         self.y += dy
+        self.gamemap.entity_moved(self, self.x - dx, self.y - dy)
 
 class Actor(Entity):
+    __slots__ = ("ai", "equipment", "fighter", "inventory", "level", "speed", "sight_radius")
+
     def __init__(
             self,
             *,
@@ -96,6 +123,8 @@ class Actor(Entity):
             fighter: Fighter,
             inventory: Inventory,
             level: Level,
+            speed: int = 100,
+            sight_radius: int = 8,
     ):
         super().__init__(
             x=x,
@@ -108,6 +137,10 @@ class Actor(Entity):
         )
 
         self.ai: Optional[BaseAI] = ai_cls(self)
+        # 100 is normal speed, 200 acts twice per normal turn, 50 every other turn
+        self.speed = speed
+        # how far away this actor can notice the player, the player's own view is 8
+        self.sight_radius = sight_radius
 
         self.equipment: Equipment = equipment
         self.equipment.parent = self
@@ -121,11 +154,32 @@ class Actor(Entity):
         self.level = level
         self.level.parent = self
 
+    def __setstate__(self, state: dict) -> None:
+        # saves from before monsters had speeds and their own sight
+        state.setdefault("speed", 100)
+        state.setdefault("sight_radius", 8)
+        super().__setstate__(state)
+
+    def clone(self, parent: Optional[GameMap] = None) -> Actor:
+        clone = super().clone(parent)
+        clone.ai = self.ai.clone(clone) if self.ai else None
+        clone.fighter = self.fighter.clone(clone)
+        if self.inventory.capacity:
+            clone.inventory = self.inventory.clone(clone)
+            clone.equipment = self.equipment.clone(clone)
+            clone.level = self.level.clone(clone)
+        # else the flyweight case: monsters that cant carry anything never equip
+        # items or gain xp, so all of them share their prototype's components
+        # parent on those stays the prototype, the components note it where defined
+        return clone
+
     @property
     def is_alive(self) -> bool:
         return bool(self.ai)
 
 class Item(Entity):
+    __slots__ = ("consumable", "equippable")
+
     def __init__(
             self,
             *,
@@ -155,4 +209,12 @@ class Item(Entity):
         self.equippable = equippable
 
         if self.equippable:
-            self.equippable.parent = self
\ No newline at end of file
+            self.equippable.parent = self
+
+    def clone(self, parent: Optional[Union[GameMap, Inventory]] = None) -> Item:
+        clone = super().clone(parent)
+        if self.consumable:
+            clone.consumable = self.consumable.clone(clone)
+        if self.equippable:
+            clone.equippable = self.equippable.clone(clone)
+        return clone
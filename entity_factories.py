@@ -38,7 +38,8 @@ goblin_archer = Actor(
     equipment=Equipment(),
     fighter=Fighter(hp=5, base_defense=0, base_power=3),
     inventory=Inventory(capacity=0),
-    level=Level(xp_given=75)
+    level=Level(xp_given=75),
+    sight_radius=10,
 )
 troll = Actor(
     char="T",
@@ -58,7 +59,8 @@ jackal = Actor(
     equipment=Equipment(),
     fighter = Fighter(hp=13, base_defense=0, base_power=4),
     inventory=Inventory(capacity=0),
-    level=Level(xp_given=75)
+    level=Level(xp_given=75),
+    speed=150,
 )
 goblin = Actor(
     char="g",
@@ -113,7 +115,8 @@ beam_soldier = Actor(
     equipment=Equipment(),
     fighter=Fighter(hp=20, base_defense=2, base_power=9),
     inventory=Inventory(capacity=0),
-    level=Level(xp_given=210)
+    level=Level(xp_given=210),
+    sight_radius=10,
 )
 
 corrupted_wizard = Actor(
@@ -124,7 +127,8 @@ corrupted_wizard = Actor(
     equipment=Equipment(),
     fighter=Fighter(hp=35, base_defense=5, base_power=11),
     inventory=Inventory(capacity=0),
-    level=Level(xp_given=270)
+    level=Level(xp_given=270),
+    sight_radius=10,
 )
 #evil tank
 enchanted_statue = Actor(
@@ -136,6 +140,8 @@ enchanted_statue = Actor(
     fighter=Fighter(hp=40, base_defense=8, base_power=17),
     inventory=Inventory(capacity=0),
     level=Level(xp_given=330),
+    speed=50,
+    sight_radius=5,
 )
 agent_of_ivelan = Actor(
     char="A",
@@ -146,6 +152,7 @@ agent_of_ivelan = Actor(
     fighter=Fighter(hp=45, base_defense=7, base_power=16),
     inventory=Inventory(capacity=0),
     level=Level(xp_given=500),
+    sight_radius=12,
 )
 monolith = Actor(
     char="M",
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+import numpy as np
+from tcod.map import compute_fov
+
+
+class FovTable:
+    """
+    precomputed views for one floor layout, filled by a worker thread
+    each view covers the (2r+1)^2 window around its cell and is kept bit packed,
+    the least recently used ones get dropped once there are 'capacity' of them
+    compute_fov releases the GIL, so the worker runs alongside the game
+    """
+
+    def __init__(self, transparent: np.ndarray, radius: int, capacity: int = 4096):
+        # a copy, the table describes the terrain at the time it was made
+        self.transparent = np.ascontiguousarray(transparent, dtype=bool)
+        self.width, self.height = self.transparent.shape
+        self.radius = radius
+        self.capacity = capacity
+        self.views: OrderedDict[Tuple[int, int], np.ndarray] = OrderedDict()
+        self.lock = threading.Lock()
+        self.stopping = threading.Event()
+        self.worker: Optional[threading.Thread] = None
+        self.hits = 0
+        self.misses = 0
+
+    def window(self, x: int, y: int) -> Tuple[slice, slice]:
+        radius = self.radius
+        return (
+            slice(max(0, x - radius), min(self.width, x + radius + 1)),
+            slice(max(0, y - radius), min(self.height, y + radius + 1)),
+        )
+
+    def compute(self, x: int, y: int) -> np.ndarray:
+        """view from (x, y) over its window, not packed"""
+        window = self.window(x, y)
+        return compute_fov(
+            self.transparent[window],
+            (x - window[0].start, y - window[1].start),
+            radius=self.radius,
+        )
+
+    def store(self, x: int, y: int, view: np.ndarray) -> None:
+        packed = np.packbits(view, axis=None)
+        with self.lock:
+            self.views[x, y] = packed
+            self.views.move_to_end((x, y))
+            while len(self.views) > self.capacity:
+                self.views.popitem(last=False)
+
+    def get(self, x: int, y: int) -> Optional[np.ndarray]:
+        """the stored view from (x, y) over its window, or None"""
+        with self.lock:
+            packed = self.views.get((x, y))
+            if packed is not None:
+                self.views.move_to_end((x, y))
+        if packed is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        window = self.window(x, y)
+        shape = (window[0].stop - window[0].start, window[1].stop - window[1].start)
+        return np.unpackbits(packed, count=shape[0] * shape[1]).view(bool).reshape(shape)
+
+    def view(self, x: int, y: int) -> np.ndarray:
+        """stored view, computed and stored now if the worker hasnt got to it"""
+        view = self.get(x, y)
+        if view is None:
+            view = self.compute(x, y)
+            self.store(x, y, view)
+        return view
+
+    def start(self, walkable: np.ndarray, near: Tuple[int, int]) -> None:
+        """
+        precompute the walkable cells closest to 'near' on a worker thread
+        no more than capacity of them, so the worker doesnt evict its own results
+        """
+        xs, ys = np.nonzero(walkable)
+        order = np.argsort(np.maximum(abs(xs - near[0]), abs(ys - near[1])), kind="stable")
+        cells = list(zip(xs[order].tolist(), ys[order].tolist()))[: self.capacity]
+        self.worker = threading.Thread(target=self._fill, args=(cells,), daemon=True)
+        self.worker.start()
+
+    def _fill(self, cells) -> None:
+        for x, y in cells:
+            if self.stopping.is_set():
+                return
+            with self.lock:
+                if (x, y) in self.views:
+                    continue  # the game asked for it first
+            self.store(x, y, self.compute(x, y))
+
+    def stop(self) -> None:
+        self.stopping.set()
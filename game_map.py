@@ -1,10 +1,16 @@
 from __future__ import annotations
 
-from typing import Iterable, TYPE_CHECKING, Iterator, Optional
+import itertools
+from typing import Dict, Iterable, TYPE_CHECKING, Iterator, Optional, List, Set, Tuple
 
 import numpy as np
+import tcod
 from tcod.console import Console
+from tcod.map import compute_fov
 
+from dormancy import Dormancy
+from fov_table import FovTable
+from scheduler import TurnScheduler
 from entity import Actor, Item
 import tile_types
 
@@ -13,16 +19,25 @@ if TYPE_CHECKING:
     from entity import Entity
 
 class GameMap:
+    # derived data, left out of save files and rebuilt on first use
+    _cached_attributes = (
+        "_player_distance", "_blockers", "_locations", "_dormancy", "_scheduler",
+        "_living_actors", "_corpses", "_items",
+        "_fov_key", "_fov_window", "_fov_table", "_sight_key", "_sights",
+        "_walkable", "_transparent",
+    )
+
     def __init__(
             self, engine: Engine, width: int, height: int, entities: Iterable[Entity] = ()
     ):
         self.engine = engine
         self.width, self.height = width, height
         self.entities = set(entities)
+        # a tile_types.palette id per cell
         if self.engine.game_world.current_floor < 6:
-            self.tiles = np.full((width, height), fill_value=tile_types.wall, order="F")
+            self.tiles = np.full((width, height), tile_types.WALL, dtype=np.uint8, order="F")
         else:
-            self.tiles = np.full((width, height), fill_value=tile_types.late_wall, order="F")
+            self.tiles = np.full((width, height), tile_types.LATE_WALL, dtype=np.uint8, order="F")
         self.visible = np.full(
             (width, height), fill_value=False, order="F"
         ) #tiles player can see
@@ -31,64 +46,498 @@ class GameMap:
         ) #tiles player has explored
         self.downstairs_location = (0,0)
         self.game_win = (0,0)
+        # bumped whenever tiles change, anything derived from the terrain checks it
+        self.terrain_version = 0
+        # bumped when what the player sees changes, and when entities move, appear,
+        # disappear or die, the renderer redraws its layers when these change
+        self.view_version = 0
+        self.entity_version = 0
+        self._player_distance: Optional[np.ndarray] = None
+        self._walkable: Optional[np.ndarray] = None
+        self._transparent: Optional[np.ndarray] = None
+        self._blockers: Optional[np.ndarray] = None
+        self._locations: Optional[Dict[Tuple[int, int], Set[Entity]]] = None
+        self._dormancy: Optional[Dormancy] = None
+        self._scheduler: Optional[TurnScheduler] = None
+        self._living_actors: Optional[Set[Actor]] = None
+        self._corpses: Optional[Set[Entity]] = None
+        self._items: Optional[Set[Item]] = None
+        # inputs of the last fov update and the part of the map it could touch
+        self._fov_key: Optional[Tuple[int, int, int, int]] = None
+        self._fov_window: Optional[Tuple[slice, slice]] = None
+        self._fov_table: Optional[FovTable] = None
+        # views from the player by radius, for monster perception, see sees_player
+        self._sight_key: Optional[Tuple[int, int, int]] = None
+        self._sights: Dict[int, Tuple[np.ndarray, int, int]] = {}
+
+    def __getstate__(self) -> dict:
+        """dont save cached data, it gets rebuilt when needed"""
+        state = self.__dict__.copy()
+        for name in self._cached_attributes:
+            state.pop(name, None)
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        # saves from older versions
+        self.__dict__.setdefault("terrain_version", 0)
+        self.__dict__.setdefault("view_version", 0)
+        self.__dict__.setdefault("entity_version", 0)
+        if self.tiles.dtype == tile_types.tile_dt:
+            self.tiles = tile_types.tile_ids(self.tiles)
+        for name in self._cached_attributes:
+            setattr(self, name, None)
 
     @property
     def gamemap(self) -> GameMap:
         return self
 
+    def _partition(self) -> None:
+        """sort the entities into living actors, corpses and items"""
+        self._living_actors, self._corpses, self._items = set(), set(), set()
+        for entity in self.entities:
+            self._partition_for(entity).add(entity)
+
+    def _partition_for(self, entity: Entity) -> set:
+        if isinstance(entity, Actor) and entity.is_alive:
+            return self._living_actors
+        if isinstance(entity, Item):
+            return self._items
+        return self._corpses  # dead actors and any other scenery
+
     @property
     def actors(self) -> Iterator[Actor]:
         """Iterate over this maps living actors"""
-        yield from(
-            entity
-            for entity in self.entities
-            if isinstance(entity, Actor) and entity.is_alive
-        )
+        if self._living_actors is None:
+            self._partition()
+        # copied so actors can die or leave the map while the caller loops
+        yield from tuple(self._living_actors)
+
+    @property
+    def corpses(self) -> Iterator[Entity]:
+        if self._corpses is None:
+            self._partition()
+        yield from tuple(self._corpses)
 
     @property
     def items(self) -> Iterator[Item]:
-        yield from (entity for entity in self.entities if isinstance(entity, Item))
+        if self._items is None:
+            self._partition()
+        yield from tuple(self._items)
+
+    @property
+    def walkable(self) -> np.ndarray:
+        """walkable plane looked up from the tile ids, rebuilt after terrain_changed"""
+        if self._walkable is None:
+            self._walkable = tile_types.palette["walkable"][self.tiles]
+        return self._walkable
+
+    @property
+    def transparent(self) -> np.ndarray:
+        if self._transparent is None:
+            self._transparent = tile_types.palette["transparent"][self.tiles]
+        return self._transparent
+
+    @property
+    def blockers(self) -> np.ndarray:
+        """
+        number of movement blocking entities on each tile
+        kept up to date by the entity hooks below instead of rescanning entities
+        """
+        if self._blockers is None:
+            self._blockers = np.zeros((self.width, self.height), dtype=np.uint8, order="F")
+            for entity in self.entities:
+                if entity.blocks_movement:
+                    self._blockers[entity.x, entity.y] += 1
+        return self._blockers
+
+    @property
+    def locations(self) -> Dict[Tuple[int, int], Set[Entity]]:
+        """spatial index of the entities standing on each occupied tile"""
+        if self._locations is None:
+            self._locations = {}
+            for entity in self.entities:
+                self._locations.setdefault((entity.x, entity.y), set()).add(entity)
+        return self._locations
+
+    def _index_location(self, entity: Entity) -> None:
+        self._locations.setdefault((entity.x, entity.y), set()).add(entity)
+
+    def _unindex_location(self, entity: Entity, x: int, y: int) -> None:
+        here = self._locations[x, y]
+        here.remove(entity)
+        if not here:
+            del self._locations[x, y]
+
+    @property
+    def dormancy(self) -> Dormancy:
+        """
+        which monsters take turns, everyone starts awake after loading
+        and the far away ones fall asleep on the next enemy turn
+        """
+        if self._dormancy is None:
+            self._dormancy = Dormancy()
+            for actor in self.actors:
+                if actor is not self.engine.player:
+                    self._dormancy.add(actor)
+        return self._dormancy
+
+    @property
+    def scheduler(self) -> TurnScheduler:
+        """turn queue of the awake monsters, they all act right away after loading"""
+        if self._scheduler is None:
+            self._scheduler = TurnScheduler()
+            for actor in self.dormancy.awake:
+                self._scheduler.add(actor)
+        return self._scheduler
+
+    @property
+    def movement_cost(self) -> np.ndarray:
+        """
+        pathfinding cost of each tile, 0 is impassable
+        a lower number means more enemies will crowd behind each other in
+        hallways. A higher number means enemies will take
+        longer paths in order ot surround the player
+        """
+        return np.where(
+            self.walkable, 1 + 10 * self.blockers.astype(np.uint16), 0
+        ).astype(np.uint16)
+
+    def add_entity(self, entity: Entity) -> None:
+        """put an entity on this map at its current location"""
+        self.entities.add(entity)
+        self.entity_version += 1
+        if self._living_actors is not None:
+            self._partition_for(entity).add(entity)
+        if self._blockers is not None and entity.blocks_movement:
+            self._blockers[entity.x, entity.y] += 1
+        if self._locations is not None:
+            self._index_location(entity)
+        if (
+            self._dormancy is not None
+            and isinstance(entity, Actor)
+            and entity.is_alive
+            and entity is not self.engine.player
+        ):
+            self._dormancy.add(entity)
+            if self._scheduler is not None:
+                self._scheduler.add(entity)
+
+    def remove_entity(self, entity: Entity) -> None:
+        """take an entity off this map, call before changing its location"""
+        self.entities.remove(entity)
+        self.entity_version += 1
+        if self._living_actors is not None:
+            self._partition_for(entity).discard(entity)
+        if self._blockers is not None and entity.blocks_movement:
+            self._blockers[entity.x, entity.y] -= 1
+        if self._locations is not None:
+            self._unindex_location(entity, entity.x, entity.y)
+        if self._dormancy is not None and isinstance(entity, Actor):
+            self._dormancy.discard(entity)
+        if self._scheduler is not None and isinstance(entity, Actor):
+            self._scheduler.discard(entity)
+
+    def entity_moved(self, entity: Entity, old_x: int, old_y: int) -> None:
+        """called by an entity on this map after its location changed"""
+        self.entity_version += 1
+        if self._blockers is not None and entity.blocks_movement:
+            self._blockers[old_x, old_y] -= 1
+            self._blockers[entity.x, entity.y] += 1
+        if self._locations is not None:
+            self._unindex_location(entity, old_x, old_y)
+            self._index_location(entity)
+
+    def entity_died(self, entity: Entity) -> None:
+        """called when an actor turns into a corpse and stops blocking"""
+        self.entity_version += 1
+        if self._blockers is not None:
+            self._blockers[entity.x, entity.y] -= 1
+        if self._living_actors is not None:
+            self._living_actors.discard(entity)
+            self._corpses.add(entity)
+        if self._dormancy is not None:
+            self._dormancy.discard(entity)
+        if self._scheduler is not None:
+            self._scheduler.discard(entity)
 
     def get_blocking_entity_at_location(
             self, location_x: int, location_y: int
     ) -> Optional[Entity]:
-        for entity in self.entities:
-            if (
-                entity.blocks_movement
-                and entity.x == location_x
-                and entity.y == location_y
-            ):
+        if not self.in_bounds(location_x, location_y):
+            return None
+        if not self.blockers[location_x, location_y]:
+            return None  # nothing blocking here, skip the lookup
+        for entity in self.locations.get((location_x, location_y), ()):
+            if entity.blocks_movement:
                 return entity
         return None
 
     def get_actor_at_location(self, x: int, y: int) -> Optional[Actor]:
-        for actor in self.actors:
-            if actor.x == x and actor.y == y:
+        for entity in self.locations.get((x, y), ()):
+            if isinstance(entity, Actor) and entity.is_alive:
+                return entity
+        return None
+
+    def _actors_on_tiles(self, xs: np.ndarray, ys: np.ndarray) -> List[Actor]:
+        locations = self.locations
+        return [
+            entity
+            for location in zip(xs.tolist(), ys.tolist())
+            for entity in locations.get(location, ())
+            if isinstance(entity, Actor) and entity.is_alive
+        ]
+
+    def _occupied_window(
+            self, x1: int, y1: int, x2: int, y2: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """coordinates of tiles with a living actor in [x1, x2) by [y1, y2), clipped to the map"""
+        x1, y1 = max(0, x1), max(0, y1)
+        x2, y2 = min(self.width, x2), min(self.height, y2)
+        if x1 >= x2 or y1 >= y2:
+            return np.empty(0, np.intp), np.empty(0, np.intp)
+        # every living actor blocks movement, so the blocker plane doubles as an actor mask
+        xs, ys = np.nonzero(self.blockers[x1:x2, y1:y2])
+        return xs + x1, ys + y1
+
+    def actors_in_rect(self, x1: int, y1: int, x2: int, y2: int) -> List[Actor]:
+        """living actors with x1 <= x < x2 and y1 <= y < y2"""
+        return self._actors_on_tiles(*self._occupied_window(x1, y1, x2, y2))
+
+    def actors_in_radius(self, x: int, y: int, radius: float) -> List[Actor]:
+        """living actors at most 'radius' away from (x, y), same measure as Entity.distance"""
+        reach = int(radius)
+        xs, ys = self._occupied_window(x - reach, y - reach, x + reach + 1, y + reach + 1)
+        inside = (xs - x) ** 2 + (ys - y) ** 2 <= radius ** 2
+        return self._actors_on_tiles(xs[inside], ys[inside])
+
+    def nearest_visible_actor(
+            self, x: int, y: int, max_range: float, exclude: Optional[Entity] = None
+    ) -> Optional[Actor]:
+        """the closest living actor in the player's view less than max_range + 1 away"""
+        reach = int(max_range) + 1
+        xs, ys = self._occupied_window(x - reach, y - reach, x + reach + 1, y + reach + 1)
+        visible = self.visible[xs, ys]
+        xs, ys = xs[visible], ys[visible]
+        distance_squared = (xs - x) ** 2 + (ys - y) ** 2
+        in_range = distance_squared < (max_range + 1) ** 2
+        xs, ys, distance_squared = xs[in_range], ys[in_range], distance_squared[in_range]
+
+        order = np.argsort(distance_squared, kind="stable")
+        for actor in self._actors_on_tiles(xs[order], ys[order]):
+            if actor is not exclude:
                 return actor
         return None
 
+    def get_entities_at_location(self, x: int, y: int) -> Tuple[Entity, ...]:
+        """every entity on this tile, safe to add or remove entities while looping"""
+        return tuple(self.locations.get((x, y), ()))
+
+    def terrain_changed(self) -> None:
+        """call after editing self.tiles"""
+        self.terrain_version += 1
+        self.view_version += 1
+        self._player_distance = None
+        self._walkable = self._transparent = None
+        self.stop_fov_table()  # made for the old layout
+
+    def fov_window(self, x: int, y: int, radius: int) -> Tuple[slice, slice]:
+        """the part of the map a view of the given radius from (x, y) can reach"""
+        return (
+            slice(max(0, x - radius), min(self.width, x + radius + 1)),
+            slice(max(0, y - radius), min(self.height, y + radius + 1)),
+        )
+
+    def update_visible(self, x: int, y: int, radius: int) -> None:
+        """
+        set visible to the view from (x, y) and mark it explored
+        nothing is done if the position, radius and terrain are the same as last time
+        """
+        key = (x, y, radius, self.terrain_version)
+        if key == self._fov_key:
+            return
+        window = self.fov_window(x, y, radius)
+        if self._fov_window is None:
+            self.visible[:] = False
+        else:
+            self.visible[self._fov_window] = False  # nothing outside it was visible
+        if self._fov_table is not None and self._fov_table.radius == radius:
+            self.visible[window] = self._fov_table.view(x, y)
+        else:
+            self.visible[window] = compute_fov(
+                self.transparent[window],
+                (x - window[0].start, y - window[1].start),
+                radius=radius,
+            )
+        self.explored[window] |= self.visible[window]
+        self._fov_key, self._fov_window = key, window
+        self.view_version += 1
+
+    def sight_of_player(self, radius: int) -> Tuple[np.ndarray, int, int]:
+        """
+        the player's view at this radius over its window, with the window's corner
+        kept until the player moves or the terrain changes
+        computed with the symmetric algorithm, so a cell is in it exactly when the
+        player is in the view from that cell at the same radius
+        """
+        player = self.engine.player
+        key = (player.x, player.y, self.terrain_version)
+        if key != self._sight_key:
+            self._sight_key, self._sights = key, {}
+        sight = self._sights.get(radius)
+        if sight is None:
+            window = self.fov_window(player.x, player.y, radius)
+            view = compute_fov(
+                self.transparent[window],
+                (player.x - window[0].start, player.y - window[1].start),
+                radius=radius,
+                algorithm=tcod.constants.FOV_SYMMETRIC_SHADOWCAST,
+            )
+            sight = self._sights[radius] = view, window[0].start, window[1].start
+        return sight
+
+    def sees_player(self, xs: np.ndarray, ys: np.ndarray, radii: np.ndarray) -> np.ndarray:
+        """
+        which monsters standing at (xs, ys) with sight radius 'radii' can see the player
+        sight is symmetric, so one view from the player per distinct radius answers
+        for every monster with that radius. a view at a bigger radius cut down
+        wouldnt do, views at different radii differ in more than their extent
+        """
+        seen = np.zeros(len(xs), dtype=bool)
+        for radius in np.unique(radii).tolist():
+            view, left, top = self.sight_of_player(radius)
+            view_xs, view_ys = xs - left, ys - top
+            inside = (
+                (radii == radius) & (view_xs >= 0) & (view_ys >= 0)
+                & (view_xs < view.shape[0]) & (view_ys < view.shape[1])
+            )
+            seen[inside] = view[view_xs[inside], view_ys[inside]]
+        return seen
+
+    def actor_sees_player(self, actor: Actor) -> bool:
+        return bool(self.sees_player(
+            np.array([actor.x]), np.array([actor.y]), np.array([actor.sight_radius])
+        )[0])
+
+    @property
+    def fov_table(self) -> Optional[FovTable]:
+        return self._fov_table
+
+    def start_fov_table(self, radius: int, near: Tuple[int, int]) -> FovTable:
+        """start precomputing views for this layout in the background, see FovTable"""
+        self.stop_fov_table()
+        self._fov_table = FovTable(self.transparent, radius)
+        self._fov_table.start(self.walkable, near)
+        return self._fov_table
+
+    def stop_fov_table(self) -> None:
+        if self._fov_table is not None:
+            self._fov_table.stop()
+            self._fov_table = None
+
+    def invalidate_player_distance(self) -> None:
+        """forget the distance map, it gets recomputed the next time a monster asks"""
+        self._player_distance = None
+
+    @property
+    def player_distance(self) -> np.ndarray:
+        """
+        distance from every tile to the player, shared by all chasing monsters
+        computed once per enemy turn instead of one path search per monster
+        """
+        if self._player_distance is None:
+            player = self.engine.player
+            distance = tcod.path.maxarray((self.width, self.height), order="F")
+            distance[player.x, player.y] = 0
+            tcod.path.dijkstra2d(distance, self.movement_cost, 2, 3, out=distance)
+            self._player_distance = distance
+        return self._player_distance
+
+    def path_to_player(self, x: int, y: int) -> List[Tuple[int, int]]:
+        """
+        walk downhill on the distance map from (x, y) to the player,
+        the starting point is not included. empty list if there is no path
+        """
+        path: List[List[int]] = tcod.path.hillclimb2d(
+            self.player_distance, (x, y), True, True
+        )[1:].tolist()
+        return [(index[0], index[1]) for index in path]
+
+    def downhill_steps(self, xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+        """
+        for each (x, y) pair, the (dx, dy) step onto the free neighbour closest
+        to the player on the distance map, (0, 0) if no neighbour gets closer
+        """
+        offsets = np.array(
+            [(-1, -1), (0, -1), (1, -1), (-1, 0), (1, 0), (-1, 1), (0, 1), (1, 1)],
+            dtype=np.intp,
+        )
+        distance = self.player_distance
+        neighbor_x = xs[:, np.newaxis] + offsets[:, 0]
+        neighbor_y = ys[:, np.newaxis] + offsets[:, 1]
+        inside = (
+            (neighbor_x >= 0) & (neighbor_x < self.width)
+            & (neighbor_y >= 0) & (neighbor_y < self.height)
+        )
+        neighbor_x = neighbor_x.clip(0, self.width - 1)
+        neighbor_y = neighbor_y.clip(0, self.height - 1)
+
+        neighbor_distance = distance[neighbor_x, neighbor_y]
+        neighbor_distance[~inside | (self.blockers[neighbor_x, neighbor_y] > 0)] = np.iinfo(
+            neighbor_distance.dtype
+        ).max
+        best = neighbor_distance.argmin(axis=1)
+        steps = offsets[best]
+        closer = neighbor_distance[np.arange(len(best)), best] < distance[xs, ys]
+        steps[~closer] = 0
+        return steps
+
+    def downhill_step(self, x: int, y: int) -> Tuple[int, int]:
+        """
+        downhill_steps for a single (x, y) with the blockers as they are now,
+        a plain loop is quicker than the arrays for one monster
+        """
+        distance = self.player_distance
+        blockers = self.blockers
+        best, best_distance = (0, 0), distance[x, y]
+        for dx, dy in ((-1, -1), (0, -1), (1, -1), (-1, 0), (1, 0), (-1, 1), (0, 1), (1, 1)):
+            neighbor_x, neighbor_y = x + dx, y + dy
+            if (
+                self.in_bounds(neighbor_x, neighbor_y)
+                and not blockers[neighbor_x, neighbor_y]
+                and distance[neighbor_x, neighbor_y] < best_distance
+            ):
+                best, best_distance = (dx, dy), distance[neighbor_x, neighbor_y]
+        return best
+
     def in_bounds(self, x: int, y:int) -> bool:
         """return True if x and y are in bounds"""
         return 0 <= x <self.width and 0 <= y < self.height
 
     def render(self, console: Console) -> None:
+        """renders the map and the entities in view"""
+        self.render_terrain(console)
+        self.render_entities(console)
+
+    def render_terrain(self, console: Console) -> None:
         """
-        renders the map
         if a tile is in "visible" draw with "light
         if it is not but is explored, draw with "dark"
         else SHROUD
         """
-        console.tiles_rgb[0:self.width, 0:self.height] = np.select(
-            condlist=[self.visible, self.explored],
-            choicelist=[self.tiles["light"], self.tiles["dark"]],
-            default=tile_types.SHROUD,
-        )
-
-        entities_sorted_for_rendering = sorted(
-            self.entities, key = lambda x: x.render_order.value
+        render_ids = np.where(
+            self.visible,
+            self.tiles,
+            np.where(self.explored, self.tiles + tile_types.DARK_OFFSET, tile_types.SHROUD_ID),
         )
+        # gathered as raw records, much faster than going through the struct fields
+        rgba = console.rgba
+        cells = rgba.view(np.dtype((np.void, rgba.dtype.itemsize)))
+        cells[0:self.width, 0:self.height] = tile_types.graphics_cells[render_ids]
 
-        for entity in entities_sorted_for_rendering:
+    def render_entities(self, console: Console) -> None:
+        # corpses first so items and then actors get drawn over them
+        for entity in itertools.chain(self.corpses, self.items, self.actors):
             #only print entities that are in FOV
             if self.visible[entity.x, entity.y]:
                 console.print(
@@ -125,6 +574,9 @@ class GameWorld:
 
         self.current_floor += 1
 
+        old_map = getattr(self.engine, "game_map", None)
+        if old_map is not None:
+            old_map.stop_fov_table()
         self.engine.game_map = generate_dungeon(
             max_rooms=self.max_rooms,
             room_min_size=self.room_min_size,
@@ -140,6 +140,9 @@ class EventHandler(BaseEventHandler):
             return False #skip enemy turn
         self.engine.handle_enemy_turns()
         self.engine.update_fov()
+        self.engine.turns += 1
+        if self.engine.autosaver is not None:
+            self.engine.autosaver.turn_finished(self.engine)
         return True
 
 
@@ -481,33 +484,55 @@ class AreaRangedAttackHandler(SelectIndexHandler):
         return self.callback((x,y))
 
 class HistoryViewer(EventHandler):
-    """Print the message history on a larger window which can be navigated"""
+    """
+    Print the message history on a larger window which can be navigated
+    only the lines in view get drawn, they are found through the log's line index
+    """
     def __init__(self, engine: Engine):
         super().__init__(engine)
-        self.log_length = len(engine.message_log.messages)
+        self.log_length = len(engine.message_log)
         self.cursor = self.log_length-1
+        self.log_console: Optional[tcod.Console] = None
+        self.drawn_cursor: Optional[int] = None
 
     def on_render(self, console: tcod.Console)->None:
         super().on_render(console) #draw main state as bbkgrnd
 
-        log_console = tcod.Console(console.width-6, console.height-6)
-
+        if self.log_console is None or (self.log_console.width, self.log_console.height) != (
+                console.width - 6, console.height - 6
+        ):
+            self.log_console = tcod.Console(console.width-6, console.height-6)
+            self.drawn_cursor = None
+        if self.drawn_cursor != self.cursor:
+            self.draw_log(self.log_console)
+            self.drawn_cursor = self.cursor
+        self.log_console.blit(console, 3,3)
+
+    def draw_log(self, log_console: tcod.Console) -> None:
+        """the messages up to the cursor, the cursor's last line at the bottom"""
+        log_console.clear()
         #draw a frame with a custom banner title
         log_console.draw_frame(0,0,log_console.width, log_console.height)
         log_console.print_box(
             0,0,log_console.width, 1, "-|Message history|-", alignment=tcod.CENTER
         )
 
-        # render message log using cursor param
-        self.engine.message_log.render_messages(
-            log_console,
-            1,
-            1,
-            log_console.width-2,
-            log_console.height-2,
-            self.engine.message_log.messages[: self.cursor +1]
-        )
-        log_console.blit(console, 3,3)
+        width, height = log_console.width - 2, log_console.height - 2
+        log = self.engine.message_log
+        index = log.line_index(width)
+        end = index.ends[self.cursor] if self.cursor >= 0 else 0
+        start = max(0, end - height)
+        message_index, skip = index.locate(start)
+
+        y = 1 + height - (end - start)  # bottom aligned when there are few lines
+        while y <= height:
+            message = log[message_index]  # archived ones are paged in
+            for line in message.lines(width)[skip:]:
+                if y > height:
+                    break
+                log_console.print(x=1, y=y, string=line, fg=message.fg)
+                y += 1
+            message_index, skip = message_index + 1, 0
 
     def ev_keydown(self, event: tcod.event.KeyDown)->Optional[MainEventHandler]:
         #conditional movement
@@ -581,6 +606,7 @@ class MainEventHandler(EventHandler):
 class GameOverEventHandler(EventHandler):
     def on_quit(self) -> None:
         """Handle exiting out of a finished game"""
+        self.engine.stop_autosave()
         if os.path.exists("savegame.sav"):
             os.remove("savegame.sav")
         raise exceptions.QuitWithoutSaving() # avoid saving a finished game
@@ -614,6 +640,7 @@ class GameWinEventHandler(EventHandler):
         )
     def on_quit(self) -> None:
         """Handle exiting out of a finished game"""
+        self.engine.stop_autosave()
         if os.path.exists("savegame.sav"):
             os.remove("savegame.sav")
         raise exceptions.QuitWithoutSaving() # avoid saving a finished game
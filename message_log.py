@@ -1,11 +1,22 @@
-from typing import List, Reversible, Tuple, Iterable
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_right
+from collections import OrderedDict
+from typing import Dict, FrozenSet, Iterator, List, Optional, Reversible, Tuple, Iterable
+import pickle
 import textwrap
+import zlib
 
 import tcod
 
 import color
+from slotted import Slotted
+
+class Message(Slotted):
+    __slots__ = ("plain_text", "fg", "count", "_lines")
+    unsaved_slots = ("_lines",)
 
-class Message:
     def __init__(self, text: str, fg: Tuple[int,int,int]):
         self.plain_text = text
         self.fg = fg
@@ -18,9 +29,226 @@ class Message:
             return f"{self.plain_text} (x{self.count})"
         return self.plain_text
 
+    def lines(self, width: int) -> List[str]:
+        """full_text wrapped to 'width', cached per width until the count changes"""
+        cached = getattr(self, "_lines", None)
+        if cached is None or cached[0] != self.count:
+            cached = self._lines = (self.count, {})
+        by_width: Dict[int, List[str]] = cached[1]
+        lines = by_width.get(width)
+        if lines is None:
+            lines = by_width[width] = list(MessageLog.wrap(self.full_text, width))
+        return lines
+
+class LineIndex:
+    """
+    where each message of a log starts once wrapped to one width
+    ends[i] is the number of lines up to and including message i
+    """
+
+    def __init__(self, width: int):
+        self.width = width
+        self.ends = array("q")
+
+    def extend(self, line_counts: Iterable[int]) -> None:
+        total = self.line_count
+        for count in line_counts:
+            total += count
+            self.ends.append(total)
+
+    def update(self, log: MessageLog) -> None:
+        """index messages added since the last update"""
+        if self.ends:
+            self.ends.pop()  # the last message may have stacked since, redo it
+        archived = log.archived
+        if len(self.ends) < archived:
+            self.extend(log.archive.line_counts(self.width, len(self.ends)))
+        self.extend(
+            len(message.lines(self.width))
+            for message in log.messages[len(self.ends) - archived:]
+        )
+
+    def drop(self, count: int) -> None:
+        """forget the first 'count' messages, the archive let go of them"""
+        if count >= len(self.ends):
+            self.ends = array("q")
+            return
+        offset = self.ends[count - 1]
+        self.ends = array("q", (end - offset for end in self.ends[count:]))
+
+    @property
+    def line_count(self) -> int:
+        return self.ends[-1] if self.ends else 0
+
+    def locate(self, line: int) -> Tuple[int, int]:
+        """the message holding 'line' and the line's offset inside it, a binary search"""
+        index = bisect_right(self.ends, line)
+        return index, line - (self.ends[index - 1] if index else 0)
+
+class Segment(Slotted):
+    """
+    a run of archived messages, pickled and zlib compressed as one blob
+    line_counts holds how many lines each message wraps to, per width that was
+    indexed when it was archived, as packed uint16s so indexing it needs no decompressing
+    """
+    __slots__ = ("count", "data", "line_counts")
+
+    def __init__(self, messages: List[Message], widths: Iterable[int]):
+        self.count = len(messages)
+        self.data = zlib.compress(pickle.dumps(
+            [(message.plain_text, message.fg, message.count) for message in messages],
+            protocol=pickle.HIGHEST_PROTOCOL,
+        ))
+        self.line_counts: Dict[int, bytes] = {
+            width: array("H", (len(message.lines(width)) for message in messages)).tobytes()
+            for width in widths
+        }
+
+    def decode(self) -> List[Message]:
+        messages = []
+        for text, fg, count in pickle.loads(zlib.decompress(self.data)):
+            message = Message(text, fg)
+            message.count = count
+            messages.append(message)
+        return messages
+
+class MessageArchive:
+    """
+    the older messages of a log in compressed segments, appended to and never edited
+    past max_segments the oldest segment is dropped for good, so memory and save size
+    stay flat however long the game. 100 segments of MessageLog.segment_size messages
+    keep the last 50000, None keeps the whole history
+    segments are decompressed when something asks for their messages, the last few are kept around
+    """
+
+    # segments ever appended, tells saves apart from the last one, see save_format.section_keys
+    appended = 0
+
+    def __init__(self, max_segments: Optional[int] = 100):
+        self.max_segments = max_segments
+        self.segments: List[Segment] = []
+        self.ends: List[int] = []  # messages up to and including each segment
+        self._decoded: Optional[OrderedDict[int, List[Message]]] = None
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        state["_decoded"] = None
+        return state
+
+    def __len__(self) -> int:
+        return self.ends[-1] if self.ends else 0
+
+    def append(self, segment: Segment) -> int:
+        """add a segment, returns how many of the oldest messages were dropped to make room"""
+        self.segments.append(segment)
+        self.ends.append(len(self) + segment.count)
+        self.appended += 1
+        dropped = 0
+        while self.max_segments is not None and len(self.segments) > self.max_segments:
+            dropped += self.segments.pop(0).count
+        if dropped:
+            self.ends = [end - dropped for end in self.ends[-len(self.segments):]]
+            self._decoded = None  # keyed by position, which just moved
+        return dropped
+
+    def segment_messages(self, position: int) -> List[Message]:
+        """the messages of one segment, decompressed if they arent already"""
+        if self._decoded is None:
+            self._decoded = OrderedDict()
+        messages = self._decoded.get(position)
+        if messages is None:
+            messages = self._decoded[position] = self.segments[position].decode()
+            while len(self._decoded) > 4:
+                self._decoded.popitem(last=False)
+        else:
+            self._decoded.move_to_end(position)
+        return messages
+
+    def __getitem__(self, index: int) -> Message:
+        position = bisect_right(self.ends, index)
+        start = self.ends[position - 1] if position else 0
+        return self.segment_messages(position)[index - start]
+
+    def line_counts(self, width: int, start: int) -> Iterator[int]:
+        """lines each message from 'start' on wraps to at 'width'"""
+        position = bisect_right(self.ends, start)
+        for position in range(position, len(self.segments)):
+            first = self.ends[position - 1] if position else 0
+            segment = self.segments[position]
+            packed = segment.line_counts.get(width)
+            if packed is not None:
+                counts = array("H")
+                counts.frombytes(packed)
+            else:
+                counts = [len(message.lines(width)) for message in self.segment_messages(position)]
+            yield from counts[max(0, start - first):]
+
 class MessageLog:
+    """
+    recent messages are kept in 'messages', at most capacity + segment_size of them
+    older ones are moved to the archive a segment at a time, see MessageArchive
+    indexes from 0 to len(log) cover both, oldest first
+    """
+    # bumped by every add_message, tells the renderer to redraw the log
+    version = 0
+    capacity = 1000
+    segment_size = 500
+    # saves from before the archive have none until they spill
+    archive: Optional[MessageArchive] = None
+    # widths line counts are kept for when archiving, those the history viewer has used
+    indexed_widths: FrozenSet[int] = frozenset()
+    _line_indexes: Optional[Dict[int, LineIndex]] = None
+
     def __init__(self) -> None:
         self.messages: List[Message] = []
+        self.archive = MessageArchive()
+
+    def __getstate__(self) -> dict:
+        """line indexes are rebuilt when needed"""
+        state = self.__dict__.copy()
+        state.pop("_line_indexes", None)
+        return state
+
+    @property
+    def archived(self) -> int:
+        return len(self.archive) if self.archive is not None else 0
+
+    def __len__(self) -> int:
+        return self.archived + len(self.messages)
+
+    def __getitem__(self, index: int) -> Message:
+        """message 'index' counting from the oldest one kept, archived or not"""
+        archived = self.archived
+        if index < 0:
+            index += archived + len(self.messages)
+        if index < archived:
+            return self.archive[index]
+        return self.messages[index - archived]
+
+    def line_index(self, width: int) -> LineIndex:
+        """the up to date line index of this log at 'width'"""
+        if self._line_indexes is None:
+            self._line_indexes = {}
+        index = self._line_indexes.get(width)
+        if index is None:
+            index = self._line_indexes[width] = LineIndex(width)
+            self.indexed_widths = self.indexed_widths | {width}
+        index.update(self)
+        return index
+
+    def spill(self) -> None:
+        """move the oldest segment_size recent messages to the archive"""
+        if self.archive is None:
+            self.archive = MessageArchive()
+        indexes = (self._line_indexes or {}).values()
+        for index in indexes:
+            index.update(self)  # so it wont need the spilled messages again
+        spilled = self.messages[:self.segment_size]
+        del self.messages[:self.segment_size]
+        dropped = self.archive.append(Segment(spilled, self.indexed_widths))
+        if dropped:
+            for index in indexes:
+                index.drop(dropped)
 
     def add_message(
             self,
@@ -32,10 +260,13 @@ class MessageLog:
         """add message to this log.
         'text' is the message text. fg is text color
         if stack is true than message can stack with previous message"""
+        self.version += 1
         if stack and self.messages and text == self.messages[-1].plain_text:
             self.messages[-1].count +=1
         else:
             self.messages.append(Message(text, fg))
+            while len(self.messages) >= self.capacity + self.segment_size:
+                self.spill()
 
     def render(
             self,
@@ -73,7 +304,7 @@ class MessageLog:
         y_offset = height -1
 
         for message in reversed(messages):
-            for line in reversed(list(cls.wrap(message.full_text, width))):
+            for line in reversed(message.lines(width)):
                 console.print(x=x, y=y+y_offset, string=line, fg=message.fg)
                 y_offset -=1
                 if y_offset <0:
@@ -268,7 +268,7 @@ def place_entities(
         x = random.randint(room.x1 + 1, room.x2 - 1)
         y = random.randint(room.y1 + 1, room.y2 - 1)
 
-        if not any(entity.x ==x and entity.y ==y for entity in dungeon.entities):
+        if not dungeon.get_entities_at_location(x, y):
             entity.spawn(dungeon, x, y)
 
 def tunnel_between(
@@ -342,7 +342,7 @@ def generate_dungeon(
             # if there are no interesects, valid room
 
             # dig rooms
-            dungeon.tiles[new_room.inner] = tile_types.floor
+            dungeon.tiles[new_room.inner] = tile_types.FLOOR
 
             if len(rooms) == 0:
                 # player starting room
@@ -350,10 +350,10 @@ def generate_dungeon(
             else: # all rooms after the first
                 # Dig tunnel between this room and previous room
                 for x, y in tunnel_between(rooms[-1].center, new_room.center):
-                    dungeon.tiles[x, y] = tile_types.floor
+                    dungeon.tiles[x, y] = tile_types.FLOOR
                 center_of_last_room = new_room.center
             place_entities(new_room, dungeon, engine.game_world.current_floor)
-            dungeon.tiles[center_of_last_room] = tile_types.down_stairs
+            dungeon.tiles[center_of_last_room] = tile_types.DOWN_STAIRS
             dungeon.downstairs_location = center_of_last_room
             # append new room to list
             rooms.append(new_room)
@@ -373,7 +373,7 @@ def generate_dungeon(
             # if there are no interesects, valid room
 
             # dig rooms
-            dungeon.tiles[new_room.inner] = tile_types.late_floor
+            dungeon.tiles[new_room.inner] = tile_types.LATE_FLOOR
 
             if len(rooms) == 0:
                 # player starting room
@@ -381,14 +381,14 @@ def generate_dungeon(
             else:  # all rooms after the first
                 # Dig tunnel between this room and previous room
                 for x, y in tunnel_between(rooms[-1].center, new_room.center):
-                    dungeon.tiles[x, y] = tile_types.late_floor
+                    dungeon.tiles[x, y] = tile_types.LATE_FLOOR
                 center_of_last_room = new_room.center
             place_entities(new_room, dungeon, engine.game_world.current_floor)
             if (engine.game_world.current_floor != 10):
-                dungeon.tiles[center_of_last_room] = tile_types.late_stairs
+                dungeon.tiles[center_of_last_room] = tile_types.LATE_STAIRS
                 dungeon.downstairs_location = center_of_last_room
             else:
-                dungeon.tiles[center_of_last_room] = tile_types.win_game
+                dungeon.tiles[center_of_last_room] = tile_types.WIN_GAME
                 dungeon.game_win = center_of_last_room
             # append new room to list
             rooms.append(new_room)
@@ -398,4 +398,5 @@ def generate_dungeon(
             center_of_last_room[0] + random.randint(0, 1),
             center_of_last_room[1] + random.randint(0, 1),
         )
+    dungeon.terrain_changed()
     return dungeon
\ No newline at end of file
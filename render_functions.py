@@ -18,28 +18,32 @@ def get_names_at_location(x: int, y: int, game_map: GameMap) -> str:
     )
     """
     names = ""
-    for entity in game_map.entities:
-        if entity.x == x and entity.y == y:
-            if (isinstance(entity, Actor) and entity.fighter.hp != 0):
-                names += f"{entity.name} {entity.fighter.hp}/{entity.fighter.max_hp} hp, attack: {entity.fighter.power}, defense: {entity.fighter.defense}, "
-            else:
-                names += f"{entity.name}, "
+    for entity in game_map.get_entities_at_location(x, y):
+        if (isinstance(entity, Actor) and entity.fighter.hp != 0):
+            names += f"{entity.name} {entity.fighter.hp}/{entity.fighter.max_hp} hp, attack: {entity.fighter.power}, defense: {entity.fighter.defense}, "
+        else:
+            names += f"{entity.name}, "
 
     return names.capitalize()
 
 def render_bar(
-        console: Console, current_value: int, maximum_value: int, total_width: int
+        console: Console,
+        current_value: int,
+        maximum_value: int,
+        total_width: int,
+        location: Tuple[int, int] = (0, 45),
 ) -> None:
+    x, y = location
     bar_width = int(float(current_value) / maximum_value * total_width)
 
-    console.draw_rect(x=0, y=45, width=20, height=1, ch=1, bg=color.bar_empty)
+    console.draw_rect(x=x, y=y, width=20, height=1, ch=1, bg=color.bar_empty)
 
     if bar_width > 0:
         console.draw_rect(
-            x=0, y=45, width=bar_width, height=1, ch=1, bg=color.bar_filled
+            x=x, y=y, width=bar_width, height=1, ch=1, bg=color.bar_filled
         )
     console.print(
-        x=1,y=45, string=f"HP: {current_value}/{maximum_value}", fg=color.bar_text
+        x=x + 1, y=y, string=f"HP: {current_value}/{maximum_value}", fg=color.bar_text
     )
 
 def render_dungeon_level(
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+from typing import Callable, Hashable, Optional, TYPE_CHECKING
+
+import numpy as np
+from tcod.console import Console
+
+import render_functions
+
+if TYPE_CHECKING:
+    from engine import Engine
+
+
+def cells(console: Console) -> np.ndarray:
+    """
+    the console's cells as raw records, copying these is a plain memcpy
+    while copying the structured rgba array goes field by field and is much slower
+    """
+    rgba = console.rgba
+    return rgba.view(np.dtype((np.void, rgba.dtype.itemsize)))
+
+
+class Layer:
+    """
+    a retained console for one part of the screen
+    it is only redrawn when the key describing its inputs changes
+    """
+
+    def __init__(self, x: int, y: int, width: int, height: int):
+        self.x, self.y = x, y
+        self.console = Console(width, height, order="F")
+        self.key: Optional[Hashable] = None
+
+    def update(self, key: Hashable, draw: Callable[[Console], None]) -> bool:
+        """redraw if the key changed, returns True if it did"""
+        if key == self.key:
+            return False
+        self.console.clear()
+        draw(self.console)
+        self.key = key
+        return True
+
+    def blit_into(self, console: Console) -> None:
+        cells(console)[
+            self.x:self.x + self.console.width, self.y:self.y + self.console.height
+        ] = cells(self.console)
+
+
+class LayeredRenderer:
+    """
+    draws the game screen out of retained layers, see Engine.render
+    terrain, the entities on top of it and each ui widget have their own buffer,
+    the finished frame is kept too, so a frame where nothing changed is one copy
+    """
+
+    def __init__(self, width: int, height: int):
+        self.frame = Console(width, height, order="F")
+        self.terrain: Optional[Layer] = None
+        self.scene: Optional[Layer] = None  # terrain plus entities
+        self.hp_bar = Layer(0, 45, 20, 1)
+        self.dungeon_level = Layer(0, 47, 20, 1)
+        self.message_log = Layer(21, 45, 40, 5)
+        self.names = Layer(21, 44, width - 21, 1)
+        self.redraws = 0  # frames that had to be put together again
+
+    def render(self, engine: Engine, console: Console) -> None:
+        game_map = engine.game_map
+        player = engine.player
+        if self.terrain is None or self.terrain.console.width != game_map.width \
+                or self.terrain.console.height != game_map.height:
+            self.terrain = Layer(0, 0, game_map.width, game_map.height)
+            self.scene = Layer(0, 0, game_map.width, game_map.height)
+
+        def draw_scene(layer: Console) -> None:
+            cells(layer)[:] = cells(self.terrain.console)
+            game_map.render_entities(layer)
+
+        # keyed on the map itself too, a new floor starts its versions over
+        self.terrain.update((game_map, game_map.view_version), game_map.render_terrain)
+        changed = self.scene.update(
+            (game_map, game_map.view_version, game_map.entity_version), draw_scene
+        )
+
+        fighter = player.fighter
+        changed |= self.hp_bar.update(
+            (fighter.hp, fighter.max_hp),
+            lambda layer: render_functions.render_bar(
+                layer, fighter.hp, fighter.max_hp, total_width=20, location=(0, 0)
+            ),
+        )
+        floor = engine.game_world.current_floor
+        changed |= self.dungeon_level.update(
+            floor,
+            lambda layer: render_functions.render_dungeon_level(layer, floor, location=(0, 0)),
+        )
+        log = engine.message_log
+        changed |= self.message_log.update(
+            log.version,
+            lambda layer: log.render(layer, x=0, y=0, width=40, height=5),
+        )
+        mouse_x, mouse_y = engine.mouse_location
+        names = render_functions.get_names_at_location(mouse_x, mouse_y, game_map)
+        changed |= self.names.update(
+            names, lambda layer: layer.print(x=0, y=0, string=names)
+        )
+
+        if changed:
+            self.frame.clear()
+            for layer in (
+                    self.scene, self.hp_bar, self.dungeon_level, self.message_log, self.names
+            ):
+                layer.blit_into(self.frame)
+            self.redraws += 1
+        cells(console)[:] = cells(self.frame)
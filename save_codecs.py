@@ -0,0 +1,110 @@
+"""
+compression for the sections of a save file
+the section table records the codec of each section, so loading needs no settings,
+presets pick a codec and its level for saving, see PRESETS
+sections bigger than two chunks are split and the chunks compressed on a thread pool,
+zlib and lzma let go of the GIL while they work
+"""
+from __future__ import annotations
+
+import lzma
+import os
+import struct
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+NONE = 0
+ZLIB = 1
+LZMA = 2
+CHUNKED = 0x80  # or'ed into the codec, the section is split in separately compressed chunks
+CHUNK_SIZE = 1 << 20
+count_struct = struct.Struct("<I")
+
+
+class CodecError(Exception):
+    pass
+
+
+class Preset:
+    def __init__(self, name: str, codec: int, level: int = 0):
+        self.name = name
+        self.codec = codec
+        self.level = level
+
+    def compress_one(self, data: bytes) -> bytes:
+        if self.codec == ZLIB:
+            return zlib.compress(data, self.level)
+        if self.codec == LZMA:
+            return lzma.compress(data, preset=self.level)
+        return bytes(data)
+
+
+PRESETS: Dict[str, Preset] = {preset.name: preset for preset in (
+    Preset("none", NONE),
+    Preset("zlib-fast", ZLIB, 1),
+    Preset("zlib", ZLIB, 6),
+    Preset("zlib-best", ZLIB, 9),
+    Preset("lzma-fast", LZMA, 0),
+    Preset("lzma", LZMA, 6),  # what saves were before save_format
+    Preset("lzma-best", LZMA, 9 | lzma.PRESET_EXTREME),
+)}
+DEFAULT = "zlib"
+
+_pool: Optional[ThreadPoolExecutor] = None
+
+
+def _map(func: Callable[[bytes], bytes], pieces: Iterable[bytes]) -> List[bytes]:
+    global _pool
+    if _pool is None:
+        _pool = ThreadPoolExecutor(
+            max_workers=min(8, os.cpu_count() or 1), thread_name_prefix="save-codec"
+        )
+    return list(_pool.map(func, pieces))
+
+
+def compress(raw: bytes, preset: str = DEFAULT) -> Tuple[int, bytes]:
+    """the codec to record and the compressed bytes"""
+    chosen = PRESETS[preset]
+    if chosen.codec == NONE:
+        return NONE, raw
+    if len(raw) < 2 * CHUNK_SIZE:
+        return chosen.codec, chosen.compress_one(raw)
+    view = memoryview(raw)
+    chunks = _map(
+        chosen.compress_one, [view[i:i + CHUNK_SIZE] for i in range(0, len(raw), CHUNK_SIZE)]
+    )
+    sizes = struct.pack(f"<{len(chunks)}I", *map(len, chunks))
+    return chosen.codec | CHUNKED, b"".join([count_struct.pack(len(chunks)), sizes] + chunks)
+
+
+def _decompressor(codec: int) -> Callable[[bytes], bytes]:
+    if codec == NONE:
+        return bytes
+    if codec == ZLIB:
+        return zlib.decompress
+    if codec == LZMA:
+        return lzma.decompress
+    raise CodecError(f"unknown codec {codec}")
+
+
+def decompress(codec: int, payload: bytes) -> bytes:
+    try:
+        return _decompress(codec, payload)
+    except (zlib.error, lzma.LZMAError, struct.error) as exc:
+        raise CodecError(str(exc)) from exc
+
+
+def _decompress(codec: int, payload: bytes) -> bytes:
+    decompress_one = _decompressor(codec & ~CHUNKED)
+    if not codec & CHUNKED:
+        return payload if codec == NONE else decompress_one(payload)
+    (count,) = count_struct.unpack_from(payload)
+    sizes = struct.unpack_from(f"<{count}I", payload, count_struct.size)
+    view = memoryview(payload)
+    pieces = []
+    offset = count_struct.size + 4 * count
+    for size in sizes:
+        pieces.append(view[offset:offset + size])
+        offset += size
+    return b"".join(_map(decompress_one, pieces))
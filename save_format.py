@@ -0,0 +1,666 @@
+"""
+the save file format
+
+a save is a short header, a fixed size summary of the game, a table of sections
+and the sections themselves:
+  meta        json, the game world settings, the map size and where its stairs are
+  archetypes  json, the entity_factories names the entity records refer to
+  tiles       the map's tile ids as raw uint8, fortran order like GameMap.tiles
+  explored    the explored plane, a byte per cell the same way
+  entities    one fixed size record per entity, see entity_dt
+  extras      whatever of an entity differs from its archetype besides the record fields
+  log         the recent messages of the message log
+  archive     the log's archive segments, stored as they are
+visible isnt saved, it is recomputed from the player's position when loading
+sections are compressed one by one with a preset from save_codecs, zlib unless asked
+otherwise, the table records each one's codec and sizes so loading detects them
+a section that didnt change can be written again without recompressing it, see autosave
+the summary is what the main menu shows of a save, read_summary gets it without
+reading any further than the table. a checksum over the header and the table and
+the file size in the summary catch damaged and truncated saves before any section
+is read, each section has a checksum of its own checked before it is decoded
+
+saves from before this format, a pickled Engine compressed with lzma, are still read
+"""
+from __future__ import annotations
+
+import io
+import json
+import lzma
+import os
+import pickle
+import struct
+import threading
+import weakref
+import zlib
+from functools import lru_cache
+from operator import attrgetter
+from typing import Any, Callable, Collection, Dict, FrozenSet, Hashable, List, Optional, Tuple, TYPE_CHECKING
+
+import numpy as np
+
+from components import ai as ai_module
+from components.ai import BaseAI
+from engine import Engine
+from entity import Actor, Entity
+import entity_factories
+from game_map import GameMap, GameWorld
+from message_log import Message, MessageArchive, MessageLog, Segment
+import save_codecs
+from slotted import all_slots
+
+if TYPE_CHECKING:
+    from components.inventory import Inventory
+
+MAGIC = b"HOIVSAVE"
+VERSION = 1
+# magic, format version, number of sections
+header_struct = struct.Struct("<8sHH")
+# crc32 of the header and the table, the file size,
+# then the Summary fields: floor, player level, hp, max hp, turns
+summary_struct = struct.Struct("<IQHHiiI")
+# name, codec, crc32 of the stored bytes, offset from the start of the file,
+# stored size, size once decompressed
+section_struct = struct.Struct("<16sB3xIQQQ")
+_unset = object()
+# the sections holding a map plane and their dtype
+PLANES = {"tiles": np.uint8, "explored": np.bool_}
+
+entity_dt = np.dtype([
+    ("archetype", np.uint16),  # index into the archetypes section
+    ("flags", np.uint8),
+    ("x", np.int32),
+    ("y", np.int32),
+    ("hp", np.int32),  # -1 for entities without a fighter
+    ("owner", np.int32),  # record of the actor carrying it, -1 if it lies on the map
+])
+PLAYER = 1
+DEAD = 2
+WEAPON = 4  # equipped by its owner
+ARMOR = 8
+EXTRAS = 16  # has an entry in the extras section
+
+# component attributes the records or the other entities already describe
+_described = {"parent", "x", "y", "ai", "_hp", "items", "weapon", "armor"}
+_components = ("fighter", "level", "inventory", "equipment", "consumable", "equippable")
+
+
+class Summary:
+    """what the main menu shows about a save without loading it"""
+
+    def __init__(self, floor: int, level: int, hp: int, max_hp: int, turns: int):
+        self.floor = floor
+        self.level = level
+        self.hp = hp
+        self.max_hp = max_hp
+        self.turns = turns
+
+    @classmethod
+    def of(cls, engine: Engine) -> Summary:
+        player = engine.player
+        return cls(
+            engine.game_world.current_floor, player.level.current_level,
+            player.fighter.hp, player.fighter.max_hp, engine.turns,
+        )
+
+    def __str__(self) -> str:
+        return f"Floor {self.floor}, level {self.level}, HP {self.hp}/{self.max_hp}, turn {self.turns}"
+
+
+class SaveFormatError(Exception):
+    pass
+
+
+@lru_cache(maxsize=None)
+def archetypes() -> Dict[str, str]:
+    """the entity_factories name of each prototype, by the prototype's name"""
+    return {
+        value.name: key for key, value in vars(entity_factories).items()
+        if isinstance(value, Entity)
+    }
+
+
+def _archetype_of(name: str, dead: bool) -> str:
+    """the archetype of an entity by its name"""
+    try:
+        if dead and name.startswith("remains of "):
+            return archetypes()[name[len("remains of "):]]
+        return archetypes()[name]
+    except KeyError:
+        raise SaveFormatError(f"{name} wasnt spawned from entity_factories") from None
+
+
+@lru_cache(maxsize=None)
+def _template(archetype: str, dead: bool) -> Entity:
+    """what a freshly spawned entity of this archetype looks like, dead or alive"""
+    entity = getattr(entity_factories, archetype).clone()
+    if dead:
+        entity.fighter.leave_corpse()
+    return entity
+
+
+@lru_cache(maxsize=None)
+def _compared_slots(cls: type) -> Tuple[str, ...]:
+    """the slots of a class _overrides looks at"""
+    return tuple(
+        name for name in all_slots(cls)
+        if name not in _described and name not in _components and name not in cls.unsaved_slots
+    )
+
+
+@lru_cache(maxsize=None)
+def _parts(cls: type) -> Tuple[str, ...]:
+    """the entity itself, as "", then the components a class of entity has"""
+    slots = all_slots(cls)
+    return ("",) + tuple(part for part in _components if part in slots)
+
+
+@lru_cache(maxsize=None)
+def _getter(cls: type) -> Optional[Callable[[Any], Any]]:
+    """all the compared slots of a class at once, as a tuple"""
+    names = _compared_slots(cls)
+    if len(names) == 1:
+        get_one = attrgetter(names[0])
+        return lambda obj: (get_one(obj),)
+    return attrgetter(*names) if names else None
+
+
+# an entity's parts as _capture_parts takes them: the part, the object itself and
+# its compared slots, a tuple or if some were never set a dict of those that were
+Parts = List[Tuple[str, Any, Any]]
+
+
+@lru_cache(maxsize=None)
+def _prototype_parts() -> FrozenSet[int]:
+    """ids of the prototypes' components, which clones can share, see Actor.clone"""
+    return frozenset(
+        id(getattr(prototype, part)) for prototype in vars(entity_factories).values()
+        if isinstance(prototype, Entity)
+        for part in _parts(type(prototype))[1:] if getattr(prototype, part) is not None
+    )
+
+
+@lru_cache(maxsize=None)
+def _components_getter(cls: type) -> Callable[[Any], tuple]:
+    """the components of a class of entity at once, in the order of _parts"""
+    names = _parts(cls)[1:]
+    return attrgetter(*names) if len(names) > 1 else lambda entity: tuple(
+        getattr(entity, name) for name in names
+    )
+
+
+def _capture_part(part: str, obj: Any) -> Tuple[str, Any, Any]:
+    try:
+        return part, obj, _getter(type(obj))(obj)
+    except AttributeError:  # a slot never set
+        return part, obj, {
+            name: value for name in _compared_slots(type(obj))
+            if (value := getattr(obj, name, _unset)) is not _unset
+        }
+
+
+def _capture_parts(entity: Entity) -> Parts:
+    parts = [_capture_part("", entity)]
+    shared = _prototype_parts()
+    for part, obj in zip(_parts(type(entity))[1:], _components_getter(type(entity))(entity)):
+        if obj is None or id(obj) in shared:
+            continue  # the prototype's, the same as the template's
+        if _getter(type(obj)) is not None:
+            parts.append(_capture_part(part, obj))
+    return parts
+
+
+def _overrides(parts: Parts, template: Entity) -> Dict[str, Dict[str, Any]]:
+    """attributes of the entity and its components that differ from the template"""
+    overrides = {}
+    for part, obj, values in parts:
+        base = getattr(template, part) if part else template
+        if obj is base:
+            continue  # shared with the prototype, see Actor.clone
+        if not isinstance(values, dict):
+            try:
+                if type(obj) is type(base) and values == _getter(type(base))(base):
+                    continue  # the usual case, checked in one go
+            except AttributeError:
+                pass  # a slot never set, compare them one by one
+            values = dict(zip(_compared_slots(type(obj)), values))
+        changed = {
+            name: value for name, value in values.items()
+            if value != getattr(base, name, _unset)
+        }
+        if changed:
+            overrides[part] = changed
+    return overrides
+
+
+@lru_cache(maxsize=None)
+def _template_ai(archetype: str, dead: bool) -> Optional[Tuple[str, Dict[str, Any]]]:
+    return _encode_ai(getattr(_template(archetype, dead), "ai", None))
+
+
+def _encode_ai(ai: Optional[BaseAI]) -> Optional[Tuple[str, Dict[str, Any]]]:
+    if ai is None:
+        return None
+    # lists like a path are copied, the game changes them in place after a snapshot
+    state = {
+        name: value[:] if isinstance(value, list) else value
+        for name, value in ai.__dict__.items() if name != "entity"
+    }
+    if "previous_ai" in state:
+        state["previous_ai"] = _encode_ai(state["previous_ai"])
+    return type(ai).__name__, state
+
+
+def _decode_ai(spec: Optional[Tuple[str, Dict[str, Any]]], entity: Actor) -> Optional[BaseAI]:
+    if spec is None:
+        return None
+    name, state = spec
+    ai = object.__new__(getattr(ai_module, name))
+    ai.__dict__.update(state)
+    ai.entity = entity
+    if "previous_ai" in state:
+        ai.previous_ai = _decode_ai(state["previous_ai"], entity)
+    return ai
+
+
+def _capture_entities(engine: Engine) -> List[tuple]:
+    """
+    what _encode_entities needs of every entity, map entities first then what each
+    actor carries, read quickly enough for the main thread. comparing with the
+    templates is left to _encode_entities
+    """
+    entities: List[Entity] = list(engine.game_map.entities)
+    owners = [-1] * len(entities)
+    for index in range(len(entities)):
+        inventory = getattr(entities[index], "inventory", None)
+        if inventory is not None and inventory.items:
+            entities.extend(inventory.items)
+            owners.extend([index] * len(inventory.items))
+
+    player = engine.player
+    captured = []
+    for index, entity in enumerate(entities):
+        flags = PLAYER if entity is player else 0
+        if owners[index] >= 0:
+            equipment = entities[owners[index]].equipment
+            if equipment.weapon is entity:
+                flags |= WEAPON
+            elif equipment.armor is entity:
+                flags |= ARMOR
+        if isinstance(entity, Actor):
+            hp = entity.fighter.hp
+            if not entity.is_alive:
+                flags |= DEAD
+            ai = _encode_ai(entity.ai)
+        else:
+            hp, ai = -1, None
+        captured.append(
+            (entity.name, flags, entity.x, entity.y, hp, owners[index], _capture_parts(entity), ai)
+        )
+    return captured
+
+
+def _encode_entities(captured: List[tuple]) -> Tuple[List[str], np.ndarray, List[tuple]]:
+    """the archetype names, the records and the extras of what _capture_entities took"""
+    names: Dict[str, int] = {}
+    records = []
+    extras = []
+    for index, (name, flags, x, y, hp, owner, parts, ai) in enumerate(captured):
+        dead = bool(flags & DEAD)
+        archetype = _archetype_of(name, dead)
+        overrides = _overrides(parts, _template(archetype, dead))
+        if ai == _template_ai(archetype, dead):
+            ai = None  # as spawned, or both dead
+        if overrides or ai is not None:
+            flags |= EXTRAS
+            extras.append((index, overrides, ai))
+        records.append((names.setdefault(archetype, len(names)), flags, x, y, hp, owner))
+    return list(names), np.array(records, dtype=entity_dt), extras
+
+
+class _Entities:
+    """the three entity sections of a snapshot, encoded once by whichever asks first"""
+
+    def __init__(self, captured: List[tuple]):
+        self.captured = captured
+        self.encoded: Optional[Tuple[List[str], np.ndarray, List[tuple]]] = None
+        self.lock = threading.Lock()
+
+    def get(self) -> Tuple[List[str], np.ndarray, List[tuple]]:
+        with self.lock:
+            if self.encoded is None:
+                self.encoded = _encode_entities(self.captured)
+            return self.encoded
+
+
+def _decode_entities(
+        game_map: GameMap, names: List[str], records: np.ndarray, extras: List[tuple]
+) -> Actor:
+    """put the saved entities on the map, returns the player"""
+    extra_for = {index: (overrides, ai) for index, overrides, ai in extras}
+    entities: List[Entity] = []
+    player = None
+    for index, (archetype, flags, x, y, hp, owner) in enumerate(records.tolist()):
+        entity = _template(names[archetype], bool(flags & DEAD)).clone()
+        entity.x, entity.y = x, y
+        if flags & EXTRAS:
+            overrides, ai = extra_for[index]
+            for part, changed in overrides.items():
+                obj = getattr(entity, part) if part else entity
+                for name, value in changed.items():
+                    object.__setattr__(obj, name, value)
+            if ai is not None:
+                entity.ai = _decode_ai(ai, entity)
+        if hp >= 0:
+            entity.fighter._hp = hp  # not on a map yet, cant die
+        if owner < 0:
+            entity.parent = game_map
+            game_map.entities.add(entity)
+        else:
+            carrier: Actor = entities[owner]
+            inventory: Inventory = carrier.inventory
+            entity.parent = inventory
+            inventory.items.append(entity)
+            if flags & WEAPON:
+                carrier.equipment.weapon = entity
+            elif flags & ARMOR:
+                carrier.equipment.armor = entity
+        if flags & PLAYER:
+            player = entity
+        entities.append(entity)
+    if player is None:
+        raise SaveFormatError("the save has no player")
+    return player
+
+
+def _encode_log(log: MessageLog) -> tuple:
+    archive = log.archive
+    return (
+        [(message.plain_text, message.fg, message.count) for message in log.messages],
+        archive.max_segments if archive is not None else MessageArchive().max_segments,
+        sorted(log.indexed_widths),
+    )
+
+
+def _encode_archive(log: MessageLog) -> List[tuple]:
+    if log.archive is None:
+        return []
+    return [
+        (segment.count, segment.data, dict(segment.line_counts))
+        for segment in log.archive.segments
+    ]
+
+
+def _decode_log(state: tuple, archived: List[tuple]) -> MessageLog:
+    recent, max_segments, widths = state
+    log = MessageLog()
+    for text, fg, count in recent:
+        message = Message(text, tuple(fg))
+        message.count = count
+        log.messages.append(message)
+    log.archive = MessageArchive(max_segments)
+    for count, data, line_counts in archived:
+        segment = object.__new__(Segment)
+        segment.__setstate__({"count": count, "data": data, "line_counts": line_counts})
+        log.archive.append(segment)
+    log.indexed_widths = frozenset(widths)
+    return log
+
+
+def section_keys(engine: Engine) -> Dict[str, Hashable]:
+    """
+    for the sections that have one, a key that changes whenever the section might
+    the others can only be told apart from the last save by their bytes
+    """
+    game_map, log = engine.game_map, engine.message_log
+    # equal while it is the same map, and doesnt keep the last floor alive after the stairs
+    map_ref = weakref.ref(game_map)
+    return {
+        "tiles": (map_ref, game_map.terrain_version),
+        "explored": (map_ref, game_map.view_version),
+        "log": (log, log.version, log.indexed_widths),
+        "archive": (log.archive, log.archive.appended if log.archive is not None else 0),
+    }
+
+
+def snapshot_sections(engine: Engine, skip: Collection[str] = ()) -> Dict[str, Any]:
+    """
+    what each section of a save is encoded from, None for those in 'skip'
+    plain values and copies the game wont change afterwards, so encode_section can
+    turn them into bytes on another thread, see autosave
+    """
+    game_map, world = engine.game_map, engine.game_world
+    entities = _Entities(_capture_entities(engine))
+    meta = {
+        "floor": world.current_floor,
+        "world": [
+            world.map_width, world.map_height, world.max_rooms,
+            world.room_min_size, world.room_max_size,
+        ],
+        "size": [game_map.width, game_map.height],
+        "downstairs": list(game_map.downstairs_location),
+        "game_win": list(game_map.game_win),
+        "terrain_version": game_map.terrain_version,
+        "mouse": list(engine.mouse_location),
+        "turns": engine.turns,
+    }
+    takers = {
+        "meta": lambda: meta,
+        "archetypes": lambda: entities,
+        "tiles": lambda: np.asfortranarray(game_map.tiles, dtype=np.uint8).tobytes(order="F"),
+        "explored": lambda: np.asfortranarray(game_map.explored, dtype=bool).tobytes(order="F"),
+        "entities": lambda: entities,
+        "extras": lambda: entities,
+        "log": lambda: _encode_log(engine.message_log),
+        "archive": lambda: _encode_archive(engine.message_log),
+    }
+    return {name: None if name in skip else take() for name, take in takers.items()}
+
+
+def encode_section(name: str, state: Any) -> bytes:
+    """the raw bytes of a section from what snapshot_sections took for it"""
+    if name == "meta":
+        return json.dumps(state).encode()
+    if name == "archetypes":
+        return json.dumps(state.get()[0]).encode()
+    if name == "entities":
+        return state.get()[1].tobytes()
+    if name == "extras":
+        return pickle.dumps(state.get()[2], protocol=pickle.HIGHEST_PROTOCOL)
+    if name in ("log", "archive"):
+        return pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL)
+    return state  # the planes are bytes already
+
+
+def raw_sections(engine: Engine) -> Dict[str, bytes]:
+    """the raw sections of a save"""
+    return {
+        name: encode_section(name, state) for name, state in snapshot_sections(engine).items()
+    }
+
+
+Stored = Tuple[int, bytes, int, int]
+
+
+def compress(name: str, raw: bytes, preset: str = save_codecs.DEFAULT) -> Stored:
+    """a section as stored, its codec, the stored bytes, the raw size and its checksum"""
+    codec, payload = save_codecs.compress(raw, preset)
+    return codec, payload, len(raw), zlib.crc32(payload)
+
+
+def pack(stored: Dict[str, Stored], summary: Summary) -> bytes:
+    """a save file out of compressed sections"""
+    table, payloads = [], []
+    offset = header_struct.size + summary_struct.size + section_struct.size * len(stored)
+    for name, (codec, payload, raw_size, crc) in stored.items():
+        table.append(
+            section_struct.pack(name.encode(), codec, crc, offset, len(payload), raw_size)
+        )
+        payloads.append(payload)
+        offset += len(payload)
+    header = header_struct.pack(MAGIC, VERSION, len(table))
+    # the checksum goes first but covers what comes after it
+    fields = summary_struct.pack(
+        0, offset, summary.floor, summary.level, summary.hp, summary.max_hp, summary.turns
+    )[4:]
+    crc = zlib.crc32(b"".join(table), zlib.crc32(fields, zlib.crc32(header)))
+    return b"".join([header, crc.to_bytes(4, "little"), fields] + table + payloads)
+
+
+def dumps(engine: Engine, preset: str = save_codecs.DEFAULT) -> bytes:
+    """the engine as a save file"""
+    return pack({
+        name: compress(name, raw, preset) for name, raw in raw_sections(engine).items()
+    }, Summary.of(engine))
+
+
+Section = Tuple[str, int, int, int, int, int]  # name, codec, crc, offset, stored, raw
+
+
+def _read_head(read: Callable[[int], bytes], file_size: int) -> Tuple[Summary, List[Section]]:
+    """
+    the summary and the section table from the start of a save,
+    'read' reads that many more bytes of it
+    """
+    head = read(header_struct.size)
+    if len(head) < header_struct.size or not head.startswith(MAGIC):
+        raise SaveFormatError("not a save file")
+    _, version, count = header_struct.unpack(head)
+    if version != VERSION:
+        raise SaveFormatError(f"save format {version} isnt supported by this game")
+    head += read(summary_struct.size)
+    table_start = len(head)
+    head += read(section_struct.size * count)
+    if len(head) != table_start + section_struct.size * count:
+        raise SaveFormatError("save file is truncated")
+    crc, size, *fields = summary_struct.unpack_from(head, header_struct.size)
+    # everything but the checksum itself
+    if zlib.crc32(head[header_struct.size + 4:], zlib.crc32(head[:header_struct.size])) != crc:
+        raise SaveFormatError("save file header is damaged")
+    if size != file_size:
+        raise SaveFormatError(
+            "save file is truncated" if file_size < size else "save file has extra data"
+        )
+    table = []
+    for i in range(count):
+        name, codec, crc, offset, stored, raw = section_struct.unpack_from(
+            head, table_start + section_struct.size * i
+        )
+        table.append((name.rstrip(bytes(1)).decode(), codec, crc, offset, stored, raw))
+    return Summary(*fields), table
+
+
+def _decompress(section: Section, payload: bytes) -> bytes:
+    name, codec, crc, _, stored, raw = section
+    if len(payload) != stored:
+        raise SaveFormatError(f"section {name} is truncated")
+    if zlib.crc32(payload) != crc:
+        raise SaveFormatError(f"section {name} is damaged")
+    try:
+        payload = save_codecs.decompress(codec, payload)
+    except save_codecs.CodecError as exc:
+        raise SaveFormatError(f"section {name}: {exc}") from exc
+    if len(payload) != raw:
+        raise SaveFormatError(f"section {name} is truncated")
+    return payload
+
+
+def read_summary(filename: str) -> Optional[Summary]:
+    """
+    the summary of a save, checked against the header checksum and the file size,
+    None for the old pickled saves
+    """
+    with open(filename, "rb") as f:
+        if not f.read(len(MAGIC)).startswith(MAGIC):
+            return None  # an old pickled save, or a broken one that loading will report
+        f.seek(0)
+        return _read_head(f.read, os.fstat(f.fileno()).st_size)[0]
+
+
+def read_sections(data: bytes) -> Dict[str, bytes]:
+    """the decompressed sections of a save file"""
+    _, table = _read_head(io.BytesIO(data).read, len(data))
+    return {
+        section[0]: _decompress(section, data[section[3]:section[3] + section[4]])
+        for section in table
+    }
+
+
+def _build(sections: Dict[str, bytes]) -> Engine:
+    """the engine out of its decompressed sections"""
+    meta = json.loads(sections["meta"])
+    width, height = meta["size"]
+
+    def plane(name: str) -> np.ndarray:
+        payload = np.frombuffer(sections[name], dtype=np.uint8)
+        return payload.view(PLANES[name]).reshape((width, height), order="F").copy(order="F")
+
+    engine = object.__new__(Engine)
+    engine.message_log = _decode_log(
+        pickle.loads(sections["log"]), pickle.loads(sections["archive"])
+    )
+    engine.mouse_location = tuple(meta["mouse"])
+    map_width, map_height, max_rooms, room_min_size, room_max_size = meta["world"]
+    engine.game_world = GameWorld(
+        engine=engine,
+        map_width=map_width,
+        map_height=map_height,
+        max_rooms=max_rooms,
+        room_min_size=room_min_size,
+        room_max_size=room_max_size,
+        current_floor=meta["floor"],
+    )
+    game_map = GameMap(engine, width, height)
+    game_map.tiles = plane("tiles")
+    game_map.explored = plane("explored")
+    game_map.downstairs_location = tuple(meta["downstairs"])
+    game_map.game_win = tuple(meta["game_win"])
+    game_map.terrain_version = meta["terrain_version"]
+    engine.game_map = game_map
+    engine.turns = meta["turns"]
+    engine.player = _decode_entities(
+        game_map,
+        json.loads(sections["archetypes"]),
+        np.frombuffer(sections["entities"], dtype=entity_dt),
+        pickle.loads(sections["extras"]),
+    )
+    engine.update_fov()
+    return engine
+
+
+def loads(data: bytes) -> Engine:
+    """the engine saved in 'data', in this format or the old pickled one"""
+    if not data.startswith(MAGIC):
+        return loads_legacy(data)
+    return _build(read_sections(data))
+
+
+def loads_legacy(data: bytes) -> Engine:
+    """a save from before this format, the whole Engine pickled and lzma compressed"""
+    engine = pickle.loads(lzma.decompress(data))
+    if not isinstance(engine, Engine):
+        raise SaveFormatError("not a save file")
+    return engine
+
+
+def write_atomic(filename: str, data: bytes) -> None:
+    """
+    write to a temporary file next to 'filename' and rename it over, so a crash
+    or a hard kill leaves either the old save or the new one, never half of one
+    """
+    temporary = f"{filename}.tmp"
+    with open(temporary, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temporary, filename)
+
+
+def save(engine: Engine, filename: str, preset: str = save_codecs.DEFAULT) -> None:
+    write_atomic(filename, dumps(engine, preset))
+
+
+def load(filename: str) -> Engine:
+    """the engine saved in a file"""
+    with open(filename, "rb") as f:
+        return loads(f.read())
@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import heapq
+from typing import Dict, List, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from entity import Actor
+
+# time a normal speed (100) actor needs for one action
+ACTION_TIME = 100
+
+
+def action_time(actor: Actor) -> int:
+    """how long one action takes this actor, faster actors need less time"""
+    return ACTION_TIME * 100 // actor.speed
+
+
+class TurnScheduler:
+    """
+    heap of actors keyed on the time of their next turn
+    each player action advances the clock and only the actors that are due get popped
+    """
+
+    def __init__(self) -> None:
+        self.time = 0
+        self.queue: List[Tuple[int, int, Actor]] = []
+        # actor -> (time, sequence) of its live heap entry, older entries are skipped
+        self.entries: Dict[Actor, Tuple[int, int]] = {}
+        self.sequence = 0
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __contains__(self, actor: Actor) -> bool:
+        return actor in self.entries
+
+    def schedule(self, actor: Actor, time: int) -> None:
+        """give actor its next turn at 'time', replacing any turn it already had"""
+        self.sequence += 1
+        self.entries[actor] = time, self.sequence
+        heapq.heappush(self.queue, (time, self.sequence, actor))
+
+    def add(self, actor: Actor) -> None:
+        """let actor act at the current time"""
+        self.schedule(actor, self.time)
+
+    def discard(self, actor: Actor) -> None:
+        """drop actor's pending turn, its heap entry goes stale"""
+        self.entries.pop(actor, None)
+
+    def advance(self, duration: int) -> None:
+        self.time += duration
+
+    def pop_due(self) -> List[Tuple[int, Actor]]:
+        """remove and return (time, actor) for every turn that has come, earliest first"""
+        due = []
+        queue = self.queue
+        while queue and queue[0][0] <= self.time:
+            time, sequence, actor = heapq.heappop(queue)
+            if self.entries.get(actor) == (time, sequence):
+                del self.entries[actor]
+                due.append((time, actor))
+        return due
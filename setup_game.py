@@ -1,18 +1,17 @@
 from __future__ import annotations
 
-import copy
-import lzma
-import pickle
 import traceback
 from typing import Optional
 
 import tcod
 
+from autosave import Autosaver
 import color
 from engine import Engine
 import entity_factories
 import input_handlers
 from game_map import GameWorld
+import save_format
 
 #load background image
 background_image = tcod.image.load("menu.png")[:,:,:3]
@@ -26,7 +25,7 @@ def new_game() -> Engine:
     room_min_size = 6
     max_rooms = 30
 
-    player = copy.deepcopy(entity_factories.player)
+    player = entity_factories.player.clone()
 
     engine = Engine(player=player)
 
@@ -47,11 +46,8 @@ def new_game() -> Engine:
         color.welcome_text
     )
 
-    dagger = copy.deepcopy(entity_factories.dagger)
-    leather_armor = copy.deepcopy(entity_factories.leather_armor)
-
-    dagger.parent = player.inventory
-    leather_armor.parent = player.inventory
+    dagger = entity_factories.dagger.clone(player.inventory)
+    leather_armor = entity_factories.leather_armor.clone(player.inventory)
 
     player.inventory.items.append(dagger)
     player.equipment.toggle_equip(dagger, add_message=False)
@@ -62,13 +58,25 @@ def new_game() -> Engine:
     return engine
 
 def load_game(filename:str) -> Engine:
-    with open(filename, "rb") as f:
-        engine = pickle.loads(lzma.decompress(f.read()))
+    """load a save, old pickled saves included"""
+    engine = save_format.load(filename)
     assert isinstance(engine, Engine)
     return engine
 class MainMenu(input_handlers.BaseEventHandler):
     """handle the main menu rendering and input"""
 
+    def __init__(self) -> None:
+        # only the save's header and table are read and checked here, the sections
+        # are checked against their checksums as Continue loads them
+        self.save_summary: Optional[save_format.Summary] = None
+        self.save_error: Optional[str] = None
+        try:
+            self.save_summary = save_format.read_summary("savegame.sav")
+        except FileNotFoundError:
+            pass
+        except (OSError, save_format.SaveFormatError) as exc:
+            self.save_error = str(exc)
+
     def on_render(self, console: tcod.Console) ->None:
         console.draw_semigraphics(background_image, 0, 0)
 
@@ -94,6 +102,22 @@ class MainMenu(input_handlers.BaseEventHandler):
                 bg_blend=tcod.BKGND_ALPHA(64)
             )
 
+        if self.save_error is not None:
+            summary, fg = "The last save is damaged", color.error
+        elif self.save_summary is not None:
+            summary, fg = str(self.save_summary), color.menu_text
+        else:
+            return
+        console.print(
+            console.width // 2,
+            console.height // 2 + 2,
+            summary,
+            fg=fg,
+            bg=color.black,
+            alignment=tcod.CENTER,
+            bg_blend=tcod.BKGND_ALPHA(64)
+        )
+
     def ev_keydown(
             self,
             event: "tcod.event.KeyDown"
@@ -101,15 +125,21 @@ class MainMenu(input_handlers.BaseEventHandler):
         if event.sym in (tcod.event.K_q, tcod.event.K_ESCAPE):
             raise SystemExit()
         elif event.sym == tcod.event.K_c:
+            if self.save_error is not None:
+                return input_handlers.PopupMessage(self, f"Failed to load save:\n{self.save_error}")
             try:
-                return input_handlers.MainEventHandler(load_game("savegame.sav"))
+                engine = load_game("savegame.sav")
             except FileNotFoundError:
                 return input_handlers.PopupMessage(self, "No saved game to load.")
             except Exception as exc:
                 traceback.print_exc()  # Print to stderr.
                 return input_handlers.PopupMessage(self, f"Failed to load save:\n{exc}")
+            engine.autosaver = Autosaver("savegame.sav")
+            return input_handlers.MainEventHandler(engine)
 
         elif event.sym == tcod.event.K_n:
-            return input_handlers.MainEventHandler(new_game())
+            engine = new_game()
+            engine.autosaver = Autosaver("savegame.sav")
+            return input_handlers.MainEventHandler(engine)
 
         return None
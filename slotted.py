@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Tuple, TypeVar
+
+S = TypeVar("S", bound="Slotted")
+_unset = object()
+
+
+@lru_cache(maxsize=None)
+def all_slots(cls: type) -> Tuple[str, ...]:
+    """every slot name of a class, base classes first"""
+    names = []
+    for klass in reversed(cls.__mro__):
+        slots = klass.__dict__.get("__slots__", ())
+        for name in (slots,) if isinstance(slots, str) else slots:
+            if name not in names:
+                names.append(name)
+    return tuple(names)
+
+
+class Slotted:
+    """
+    base for the small objects there are lots of, entities, components and messages
+    attributes live in __slots__ instead of a per instance dict
+    they pickle as a plain dict, the same shape saves had before they were slotted
+    """
+
+    __slots__ = ()
+    # slots holding caches, left out of save files
+    unsaved_slots: Tuple[str, ...] = ()
+
+    def __getstate__(self) -> dict:
+        state = {}
+        for name in all_slots(type(self)):
+            if name in self.unsaved_slots:
+                continue
+            value = getattr(self, name, _unset)
+            if value is not _unset:  # never set, like the parent of a prototype
+                state[name] = value
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        for name, value in state.items():
+            object.__setattr__(self, name, value)
+
+    def shallow_copy(self: S) -> S:
+        """new instance of the same class sharing every attribute value with this one"""
+        clone = object.__new__(type(self))
+        for name in all_slots(type(self)):
+            value = getattr(self, name, _unset)
+            if value is not _unset:
+                setattr(clone, name, value)
+        return clone
@@ -81,4 +81,29 @@ win_game = new_tile(
     transparent=True,
     dark=(ord("^"), (140,140,0), (60,60,60)),
     light=(ord("^"), (250,240,0), (150,150,150))
-)
\ No newline at end of file
+)
+# maps store one uint8 id per cell, the id indexes into this palette
+palette = np.array(
+    [wall, floor, down_stairs, late_wall, late_floor, late_stairs, win_game], dtype=tile_dt
+)
+WALL, FLOOR, DOWN_STAIRS, LATE_WALL, LATE_FLOOR, LATE_STAIRS, WIN_GAME = range(len(palette))
+
+# graphics by render id: tile id when lit, tile id + len(palette) when dark, then shroud
+graphics = np.concatenate([palette["light"], palette["dark"], [SHROUD]])
+DARK_OFFSET = len(palette)
+SHROUD_ID = 2 * len(palette)
+
+# the same graphics in the layout of Console.rgba, as raw records that copy quickly
+rgba_dt = np.dtype([("ch", np.int32), ("fg", "4B"), ("bg", "4B")])
+graphics_rgba = np.zeros(len(graphics), dtype=rgba_dt)
+graphics_rgba["ch"] = graphics["ch"]
+graphics_rgba["fg"][:, :3], graphics_rgba["fg"][:, 3] = graphics["fg"], 255
+graphics_rgba["bg"][:, :3], graphics_rgba["bg"][:, 3] = graphics["bg"], 255
+graphics_cells = graphics_rgba.view(np.dtype((np.void, rgba_dt.itemsize)))
+
+def tile_ids(tiles: np.ndarray) -> np.ndarray:
+    """palette ids for an array of tile_dt records, maps were saved like that before"""
+    ids = np.zeros(tiles.shape, dtype=np.uint8, order="F")
+    for tile_id, tile in enumerate(palette):
+        ids[tiles == tile] = tile_id
+    return ids